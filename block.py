@@ -27,8 +27,8 @@ The Block TRANSACTIONS will contain the following fields with assigned sizes:
 
 '''Imports'''
 from hashlib import sha256
-from helpers import utc_to_seconds
-from transaction import decode_raw_transaction
+from helpers import utc_to_seconds, hex_to_bytes, bytes_to_int
+from transaction import decode_raw_transaction, decode_binary_transaction, parse_raw_transaction
 
 
 class Block:
@@ -47,7 +47,8 @@ class Block:
         A new Block can be instantiated using a previous hash, target value, nonce and list of raw transactions. If a
         Block needs to be recreated, it can use the same values but specify the timestamp. The Block object will save
         the transactions as a list of transaction objects. But the raw block will contain the raw transactions (
-        similar to how Transactions have list of UTXO objects, but the raw tx contains the raw utxo.)
+        similar to how Transactions have list of UTXO objects, but the raw tx contains the raw utxo.) Already decoded
+        transaction objects are accepted as well, and are used as is.
 
         All input values will be formatted according to hardcoded bit lengths.
 
@@ -65,10 +66,7 @@ class Block:
             self.timestamp = format(timestamp, f'0{self.TIMESTAMP_BITS // 4}x')
 
         # Create list of Transaction objects
-        self.transactions = []
-        for raw_tx in transactions:
-            new_tx = decode_raw_transaction(raw_tx)
-            self.transactions.append(new_tx)
+        self.transactions = [decode_raw_transaction(t) if isinstance(t, str) else t for t in transactions]
 
         # Create and format number of transactions
         self.tx_count = format(len(self.transactions), f'0{self.TRANSACTION_NUM_BITS // 4}x')
@@ -97,17 +95,27 @@ class Block:
 
     @property
     def raw_transactions(self):
-        transaction_string = ''
-        for t in self.transactions:
-            transaction_string += t.raw_tx
-        return self.tx_count + transaction_string
+        return self.tx_count + ''.join([t.raw_tx for t in self.transactions])
+
+    @property
+    def binary_block(self):
+        return self.binary_header + self.binary_transactions
+
+    @property
+    def binary_header(self):
+        return (hex_to_bytes(self.version, self.VERSION_BITS // 8) + hex_to_bytes(self.prev_hash, self.HASH_BITS // 8)
+                + hex_to_bytes(self.merkle_root, self.HASH_BITS // 8) + hex_to_bytes(self.target, self.TARGET_BITS // 8)
+                + hex_to_bytes(self.nonce, self.NONCE_BITS // 8)
+                + hex_to_bytes(self.timestamp, self.TIMESTAMP_BITS // 8))
+
+    @property
+    def binary_transactions(self):
+        return b''.join([hex_to_bytes(self.tx_count, self.TRANSACTION_NUM_BITS // 8)]
+                        + [t.binary_tx for t in self.transactions])
 
     @property
     def tx_ids(self):
-        id_list = []
-        for t in self.transactions:
-            id_list.append(t.id)
-        return id_list
+        return [t.id for t in self.transactions]
 
     @property
     def id(self):
@@ -226,6 +234,90 @@ class Block:
             return ''
 
 
+'''
+BLOCK VIEW
+'''
+
+
+class BlockView:
+    '''
+    A read only view of a raw block. The header fields are sliced straight from the raw string, in the same hex format
+    as the Block attributes, and the id is the hash of the raw string, so neither needs the transactions to be decoded.
+    The transactions are decoded when first used, and are kept.
+
+    The view doesn't verify the merkle root. Use to_block for a raw block that hasn't been validated.
+    '''
+    HEADER_HEXCHARS = (Block.VERSION_BITS + Block.HASH_BITS + Block.HASH_BITS + Block.TARGET_BITS + Block.NONCE_BITS
+                       + Block.TIMESTAMP_BITS) // 4
+
+    def __init__(self, raw_block: str):
+        self.raw_block = raw_block
+
+        # Header indices
+        index1 = Block.VERSION_BITS // 4
+        index2 = index1 + Block.HASH_BITS // 4
+        index3 = index2 + Block.HASH_BITS // 4
+        index4 = index3 + Block.TARGET_BITS // 4
+        index5 = index4 + Block.NONCE_BITS // 4
+        index6 = index5 + Block.TIMESTAMP_BITS // 4
+        index7 = index6 + Block.TRANSACTION_NUM_BITS // 4
+
+        self.version = raw_block[:index1]
+        self.prev_hash = raw_block[index1:index2]
+        self.merkle_root = raw_block[index2:index3]
+        self.target = raw_block[index3:index4]
+        self.nonce = raw_block[index4:index5]
+        self.timestamp = raw_block[index5:index6]
+        self.tx_count = raw_block[index6:index7]
+
+        self._id = None
+        self._transactions = None
+
+    def __len__(self):
+        return int(self.tx_count, 16)
+
+    def __iter__(self):
+        return iter(self.transactions)
+
+    '''
+    PROPERTIES
+    '''
+
+    @property
+    def raw_header(self):
+        return self.raw_block[:self.HEADER_HEXCHARS]
+
+    @property
+    def raw_transactions(self):
+        return self.raw_block[self.HEADER_HEXCHARS:]
+
+    @property
+    def header(self):
+        return decode_raw_header(self.raw_block)
+
+    @property
+    def id(self):
+        if self._id is None:
+            self._id = sha256(self.raw_block.encode()).hexdigest()
+        return self._id
+
+    @property
+    def transactions(self):
+        if self._transactions is None:
+            self._transactions, _ = parse_raw_block_transactions(self.raw_block, self.HEADER_HEXCHARS)
+        return self._transactions
+
+    @property
+    def tx_ids(self):
+        return [t.id for t in self.transactions]
+
+    def to_block(self):
+        '''
+        Returns the Block, with its merkle root verified.
+        '''
+        return decode_raw_block(self.raw_block)
+
+
 '''
 DECODING 
 '''
@@ -233,20 +325,17 @@ DECODING
 
 def decode_raw_block(raw_block: str):
     '''
-    The Header size will be fixed. We get the Header dict, then the transactions list and return a Block
+    The Header size will be fixed. We get the Header dict, then parse the transactions following it in a single pass
+    and return a Block. Each transaction is decoded once and the merkle root is computed once, by the Block.
     '''
 
     # Get number of hex chars
     header_hexchars = (Block.VERSION_BITS + Block.HASH_BITS + Block.HASH_BITS
                        + Block.TIMESTAMP_BITS + Block.TARGET_BITS + Block.NONCE_BITS) // 4
 
-    # Break up string into header and transaction
-    header_string = raw_block[:header_hexchars]
-    transaction_string = raw_block[header_hexchars:]
-
-    # Decode the raw header and raw transaction
-    header_dict = decode_raw_header(header_string)
-    transactions = decode_raw_block_transactions(transaction_string)
+    # Decode the raw header and raw transactions
+    header_dict = decode_raw_header(raw_block)
+    transactions, _ = parse_raw_block_transactions(raw_block, header_hexchars)
 
     # Create the block
     new_block = Block(header_dict['prev_hash'], header_dict['target'], header_dict['nonce'],
@@ -290,15 +379,49 @@ def decode_raw_block_transactions(raw_block_tx: str) -> list:
     raw_transactions. We emphasize that we return a list of raw transactions, as the list will be used to instantiate
     a Block
     '''
+    transactions, _ = parse_raw_block_transactions(raw_block_tx)
+    return [t.raw_tx for t in transactions]
+
+
+def parse_raw_block_transactions(raw: str, offset=0):
+    '''
+    We read the number of transactions at the offset of the string, then parse each transaction from the index where
+    the previous one ended. Returns the list of transaction objects and the index following the last one.
+    '''
     # Get number of transactions
-    tx_num = int(raw_block_tx[:Block.TRANSACTION_NUM_BITS // 4])
+    index = offset + Block.TRANSACTION_NUM_BITS // 4
+    tx_num = int(raw[offset:index], 16)
 
     # Read in transactions
     transactions = []
-    temp_index = Block.TRANSACTION_NUM_BITS // 4
     for x in range(0, tx_num):
-        new_raw_tx = decode_raw_transaction(raw_block_tx[temp_index:]).raw_tx
-        transactions.append(new_raw_tx)
-        temp_index = temp_index + len(new_raw_tx)
+        new_tx, index = parse_raw_transaction(raw, index)
+        transactions.append(new_tx)
 
-    return transactions
+    return transactions, index
+
+
+def decode_binary_block(buffer, offset=0):
+    '''
+    Decodes the binary Block starting at the offset of the buffer. Returns the Block and the offset following it.
+    '''
+    # Header
+    values = []
+    index = offset
+    for bits in [Block.VERSION_BITS, Block.HASH_BITS, Block.HASH_BITS, Block.TARGET_BITS, Block.NONCE_BITS,
+                 Block.TIMESTAMP_BITS, Block.TRANSACTION_NUM_BITS]:
+        values.append(bytes_to_int(buffer, index, bits // 8))
+        index += bits // 8
+    version, prev_hash, merkle_root, target, nonce, timestamp, tx_num = values
+
+    # Transactions
+    transactions = []
+    for x in range(0, tx_num):
+        tx, index = decode_binary_transaction(buffer, index)
+        transactions.append(tx)
+
+    # Create the block and verify its construction
+    new_block = Block(format(prev_hash, f'0{Block.HASH_BITS // 4}x'), target, nonce, transactions=transactions,
+                      timestamp=timestamp, version=version)
+    assert new_block.merkle_root == format(merkle_root, f'0{Block.HASH_BITS // 4}x')
+    return new_block, index
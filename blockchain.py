@@ -19,12 +19,13 @@ The Blockchain will contain the fixed curve parameters used for the address and
 IMPORTS
 '''
 
-from block import decode_raw_block, Block
+from block import decode_raw_block, Block, BlockView
+from concurrent.futures import ProcessPoolExecutor
 from cryptography import EllipticCurve
 from hashlib import sha256, sha1
-from helpers import get_signature_parts, int_to_base58, utc_to_seconds
+from helpers import get_signature_parts, int_to_base58, utc_to_seconds, LRUCache
 from transaction import Transaction, decode_raw_transaction, GenesisTransaction
-from utxo import UTXO_INPUT, UTXO_OUTPUT
+from utxo import UTXO_INPUT, UTXO_OUTPUT, address_cache_stats
 from miner import Miner
 
 import pandas as pd
@@ -51,10 +52,38 @@ class Blockchain:
     GENESIS_TIMESTAMP = 1651769733
     GENESIS_NONCE = 28911710
 
-    def __init__(self):
+    '''
+    VALIDATION CONSTANTS
+    '''
+    PARALLEL_VALIDATION_MINIMUM = 16
+    SIGNATURE_CACHE_SIZE = 10000
+    ADDRESS_CACHE_SIZE = 10000
+
+    def __init__(self, validation_workers=0, signature_cache_size=SIGNATURE_CACHE_SIZE,
+                 address_cache_size=ADDRESS_CACHE_SIZE):
         '''
+        The validation_workers value determines how many processes are used to validate the input signatures of a
+        Block. By default, we validate in this process.
 
+        The signature cache holds the (signature, tx_id, address) values which have already been validated - e.g. when
+        a Node admits a transaction to its pool - so that they aren't validated again when the Block arrives.
+
+        The address cache holds the address of each compressed public key we've checked, so that check_address only
+        hashes a key once.
         '''
+        # Signature validation workers
+        self.validation_workers = max(validation_workers, 0)
+        self._validation_pool = None
+
+        # Validated signatures
+        self.signature_cache = LRUCache(signature_cache_size)
+
+        # Compressed public key addresses
+        self.address_cache = LRUCache(address_cache_size)
+
+        # Callables notified of the utxo changes when a Block is added or popped
+        self.utxo_listeners = []
+
         # Instantiate a blank chain
         self.chain = []
 
@@ -76,8 +105,9 @@ class Blockchain:
         self.generator = (int(genesis_tx.generator_x, 16), int(genesis_tx.generator_y, 16))
         self.group_order = int(genesis_tx.group_order, 16)
 
-        # Instantiate curve
-        self.curve = EllipticCurve(a=self.a, b=self.b, p=self.p, generator=self.generator, order=self.group_order)
+        # Instantiate curve. Public keys and signatures are checked at the curve API boundaries.
+        self.curve = EllipticCurve(a=self.a, b=self.b, p=self.p, generator=self.generator, order=self.group_order,
+                                   validation=EllipticCurve.VALIDATION_FAST)
 
         # Get mining values
         self.total_mining_amount = int(genesis_tx.amount_to_mine, 16)
@@ -100,6 +130,19 @@ class Blockchain:
     def height(self):
         return len(self.chain) - 1
 
+    @property
+    def cache_stats(self):
+        '''
+        Returns the hits, misses and sizes of the validation caches, for tuning their sizes.
+        '''
+        stats = {
+            "signatures": self.signature_cache.stats,
+            "addresses": self.address_cache.stats,
+            "public_keys": self.curve.public_key_cache.stats
+        }
+        stats.update(address_cache_stats())
+        return stats
+
     '''
     VERIFY SIGNATURE
     '''
@@ -107,23 +150,35 @@ class Blockchain:
     def check_address(self, compressed_public_key: str, address: str) -> bool:
         '''
         If we take the "Address Generating" steps with the compressed public key and end up with the given address, we return True.
-        Otherwise return False.
+        Otherwise return False. The address of each compressed public key is kept in the address cache.
         '''
 
+        # 0) Check the cache
+        key_address = self.address_cache.get(compressed_public_key)
+        if key_address is not None:
+            return key_address == address
+
         # 1) Get sha1(sha256(compressed_public_key)) value
         raw_addy = sha1(sha256(compressed_public_key.encode()).hexdigest().encode()).hexdigest()
 
         # 2) Get checksum
         checksum = sha256(sha256(raw_addy.encode()).hexdigest().encode()).hexdigest()[: self.ADDRESS_CHECKSUM_BITS // 4]
 
-        # 3) Return True/False
-        return int_to_base58(int(raw_addy + checksum, 16)) == address
+        # 3) Cache the address and return True/False
+        key_address = int_to_base58(int(raw_addy + checksum, 16))
+        self.address_cache.put(compressed_public_key, key_address)
+        return key_address == address
 
     def validate_signature(self, input_sig: str, output_addy: str, tx_id: str) -> bool:
         '''
         Given the signature in the input utxo and the address in the output utxo, we validate the signature.
+        Valid signatures are saved in the signature cache.
         '''
 
+        # Check the signature cache
+        if self.signature_cache.get((input_sig, tx_id, output_addy)):
+            return True
+
         # Read in signature
         compressed_public_key, (r_hex, s_hex) = get_signature_parts(input_sig)
 
@@ -139,7 +194,84 @@ class Blockchain:
         s = int(s_hex, 16)
 
         # Validate signature. Return True/False
-        return self.curve.verify_signature((r, s), tx_id, pk_point)
+        valid = self.curve.verify_signature((r, s), tx_id, pk_point)
+        if valid:
+            self.signature_cache.put((input_sig, tx_id, output_addy), True)
+        return valid
+
+    def validate_signatures_batch(self, entries: list) -> list:
+        '''
+        Given a list of (input_sig, output_addy, tx_id) triples, we validate all signatures at once and return a list
+        of True/False values in the same order. The address checks are done here. The public key recovery and
+        signature checks are shared using the batch verification of the curve - and are spread across the
+        validation workers if the worker pool is enabled. Entries in the signature cache are not validated again.
+        '''
+        results = [False] * len(entries)
+
+        # Read in signatures and validate addresses
+        indices = []
+        signature_entries = []
+        for index, (input_sig, output_addy, tx_id) in enumerate(entries):
+            if self.signature_cache.get((input_sig, tx_id, output_addy)):
+                results[index] = True
+                continue
+            compressed_public_key, (r_hex, s_hex) = get_signature_parts(input_sig)
+            if not self.check_address(compressed_public_key, output_addy):
+                # Logging
+                print('Address error')
+                continue
+            indices.append(index)
+            signature_entries.append((compressed_public_key, (int(r_hex, 16), int(s_hex, 16)), tx_id))
+
+        # Validate signatures
+        if self.validation_workers > 1 and len(signature_entries) >= self.PARALLEL_VALIDATION_MINIMUM:
+            valid_list = verify_signature_entries_parallel(self.validation_pool, self.curve, signature_entries,
+                                                           self.validation_workers)
+        else:
+            valid_list = verify_signature_entries(self.curve, signature_entries)
+        for index, valid in zip(indices, valid_list):
+            results[index] = valid
+            if valid:
+                input_sig, output_addy, tx_id = entries[index]
+                self.signature_cache.put((input_sig, tx_id, output_addy), True)
+        return results
+
+    '''
+    VALIDATION WORKERS
+    '''
+
+    @property
+    def validation_pool(self):
+        '''
+        The process pool used for signature validation. It is created on first use and kept for the life of the
+        Blockchain, so that each worker only builds the generator table once. The pool is shut down by
+        close_validation_pool, on leaving a with block, or when the Blockchain is garbage collected.
+        '''
+        if self._validation_pool is None:
+            self._validation_pool = ProcessPoolExecutor(max_workers=self.validation_workers)
+        return self._validation_pool
+
+    def set_validation_workers(self, workers: int):
+        '''
+        Sets the number of processes used to validate signatures. A value of 0 or 1 validates in this process.
+        '''
+        self.close_validation_pool()
+        self.validation_workers = max(workers, 0)
+
+    def close_validation_pool(self, wait=True):
+        if getattr(self, '_validation_pool', None) is not None:
+            self._validation_pool.shutdown(wait=wait)
+            self._validation_pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close_validation_pool()
+
+    def __del__(self):
+        # A discarded Blockchain shouldn't leave its worker processes behind
+        self.close_validation_pool(wait=False)
 
     '''
     DETERMINE MINING PROPERTIES
@@ -168,20 +300,43 @@ class Blockchain:
         elif heartrate < self.heartbeat:  # Too fast - bigger issue than too slow
             self.target += 2
 
+    '''
+    UTXO LISTENERS
+    '''
+
+    def add_utxo_listener(self, listener):
+        '''
+        The listener will be called as listener(added, removed) each time a Block is added or popped. Both arguments
+        are lists of (tx_id, tx_index, amount, address) rows, as in the utxo pool. For an added Block, added holds the
+        new outputs and removed the consumed outputs. For a popped Block it's the other way around.
+        '''
+        if listener not in self.utxo_listeners:
+            self.utxo_listeners.append(listener)
+
+    def remove_utxo_listener(self, listener):
+        if listener in self.utxo_listeners:
+            self.utxo_listeners.remove(listener)
+
+    def notify_utxo_listeners(self, added: list, removed: list):
+        for listener in self.utxo_listeners:
+            listener(added, removed)
+
     '''
     CONSUME UTXO INPUTS
     '''
 
     def consume_input(self, utxo_input: UTXO_INPUT):
         '''
-        We consume the corresponding utxo output for a given utxo input.
+        We consume the corresponding utxo output for a given utxo input, and return the consumed row.
         WE DO NO VALIDATION AS THIS IS ONLY CALLED AFTER ALL BLOCK VALIDATION IS DONE
         '''
 
         tx_id = utxo_input.tx_id
         tx_index = int(utxo_input.tx_index, 16)
         output_index = self.utxos.index[(self.utxos['tx_id'] == tx_id) & (self.utxos['tx_index'] == tx_index)]
-        self.utxos = self.utxos.drop(self.utxos.index[output_index])
+        consumed_row = tuple(self.utxos.loc[output_index].values[0])
+        self.utxos = self.utxos.drop(output_index)
+        return consumed_row
 
     '''
     ADD BLOCK
@@ -202,7 +357,7 @@ class Blockchain:
             return False
 
         # Verify block header values
-        last_block = decode_raw_block(self.last_block)
+        last_block = BlockView(self.last_block)
         if last_block.id != candidate_block.prev_hash:
             # Logging
             print('Previous hash error in block')
@@ -211,6 +366,9 @@ class Blockchain:
         # Consumed UTXO trackers
         consumed_inputs = []
 
+        # Signatures to validate once all inputs are found
+        signature_entries = []
+
         # Output UTXO temp dataframe
         output_utxo_df = pd.DataFrame(columns=self.COLUMNS)
 
@@ -261,13 +419,9 @@ class Blockchain:
                         print('Empty output index error')
                         return False
 
-                    # Validate the input utxo signature against the output utxo address
+                    # Schedule the input utxo signature for validation against the output utxo address
                     output_address = self.utxos.loc[output_index]['address'].values[0]
-
-                    if not self.validate_signature(i.signature, output_address, tx_id, ):
-                        # Logging
-                        print('Validate signature error')
-                        return False
+                    signature_entries.append((i.signature, output_address, tx_id))
 
                     # Scheduled input for consumption after all validation done
                     consumed_inputs.append(i)
@@ -280,13 +434,24 @@ class Blockchain:
                     output_utxo_df = pd.concat([output_utxo_df, output_row], ignore_index=True)
                     tx_count += 1
 
+        # Validate all input signatures in one batch
+        signature_results = self.validate_signatures_batch(signature_entries)
+        if not all(signature_results):
+            # Logging
+            print(f'Validate signature error for input {signature_results.index(False)}')
+            return False
+
         ##ALL VALIDATION COMPLETE##
-        # Consume the inputs
+        # Consume the inputs. Their signatures won't be validated again.
+        consumed_rows = []
         for c in consumed_inputs:
-            self.consume_input(c)
+            consumed_rows.append(self.consume_input(c))
+        for input_sig, output_addy, tx_id in signature_entries:
+            self.signature_cache.discard((input_sig, tx_id, output_addy))
 
         # Add new outputs
         self.utxos = pd.concat([self.utxos, output_utxo_df], ignore_index=True)
+        self.notify_utxo_listeners([tuple(row) for row in output_utxo_df.values], consumed_rows)
 
         # Add Block
         self.chain.append(candidate_block.raw_block)
@@ -318,6 +483,17 @@ class Blockchain:
         # Remove top most block
         removed_block = decode_raw_block(self.chain.pop(-1))
 
+        # Invalidate the cached signatures which spend the outputs of the removed block
+        removed_ids = set(removed_block.tx_ids)
+        for key in self.signature_cache.keys():
+            _, tx_id, _ = key
+            if tx_id in removed_ids:
+                self.signature_cache.discard(key)
+
+        # Utxo changes for the listeners
+        restored_rows = []
+        dropped_rows = []
+
         # For each transaction, we remove the output utxos from the db and restore the related inputs
         for tx in removed_block.transactions:
 
@@ -333,9 +509,11 @@ class Blockchain:
                 except AssertionError as msg:
                     # Logging
                     print(msg)
+                    self.notify_utxo_listeners(restored_rows, dropped_rows)
                     return False
                 self.total_mining_amount += int(tx.reward, 16)
-                self.utxos = self.utxos.drop(self.utxos.index[output_index])
+                dropped_rows.append(tuple(self.utxos.loc[output_index].values[0]))
+                self.utxos = self.utxos.drop(output_index)
             else:
                 # Drop all utxo outputs
                 for t in tx.outputs:
@@ -346,8 +524,10 @@ class Blockchain:
                     except AssertionError as msg:
                         # Logging
                         print(msg)
+                        self.notify_utxo_listeners(restored_rows, dropped_rows)
                         return False
-                    self.utxos = self.utxos.drop(self.utxos.index[output_index])
+                    dropped_rows.append(tuple(self.utxos.loc[output_index].values[0]))
+                    self.utxos = self.utxos.drop(output_index)
                     output_count += 1
 
                 # Restore all outputs for the inputs
@@ -366,7 +546,9 @@ class Blockchain:
                     temp_address = temp_output.address
                     row = pd.DataFrame([[tx_id, tx_index, temp_amount, temp_address]], columns=self.COLUMNS)
                     self.utxos = pd.concat([self.utxos, row], ignore_index=True)
+                    restored_rows.append((tx_id, tx_index, temp_amount, temp_address))
 
+        self.notify_utxo_listeners(restored_rows, dropped_rows)
         return True
 
     '''
@@ -388,3 +570,65 @@ class Blockchain:
         assert int(temp_block.id, 16) <= pow(2, 256 - int(temp_block.target, 16))
         assert temp_block.id == self.GENESIS_ID
         self.chain.append(mined_block)
+
+
+'''
+SIGNATURE VALIDATION
+'''
+
+
+def verify_signature_entries(curve: EllipticCurve, entries: list) -> list:
+    '''
+    Given a list of (compressed_public_key, (r,s), tx_id) triples, we recover the public key points and batch verify
+    the signatures. We return a list of True/False values in the same order.
+    '''
+    results = [False] * len(entries)
+
+    # Get public key points
+    indices = []
+    curve_entries = []
+    for index, (compressed_public_key, signature, tx_id) in enumerate(entries):
+        try:
+            pk_point = curve.get_public_key_point(compressed_public_key)
+        except AssertionError:
+            # Logging
+            print('Public key error')
+            continue
+        indices.append(index)
+        curve_entries.append((signature, tx_id, pk_point))
+
+    # Verify signatures
+    for index, valid in zip(indices, curve.verify_signatures_batch(curve_entries)):
+        results[index] = valid
+    return results
+
+
+# The curves used by a validation worker, kept between tasks so that their public key caches are reused
+worker_curves = {}
+
+
+def verify_signature_chunk(curve_parameters: tuple, entries: list) -> list:
+    '''
+    The task run by a validation worker. We rebuild the curve from its parameters and verify the entries.
+    '''
+    curve = worker_curves.get(curve_parameters)
+    if curve is None:
+        a, b, p, generator, order = curve_parameters
+        curve = EllipticCurve(a=a, b=b, p=p, generator=generator, order=order,
+                              validation=EllipticCurve.VALIDATION_FAST)
+        worker_curves.update({curve_parameters: curve})
+    return verify_signature_entries(curve, entries)
+
+
+def verify_signature_entries_parallel(pool: ProcessPoolExecutor, curve: EllipticCurve, entries: list,
+                                      workers: int) -> list:
+    '''
+    We split the entries into one contiguous chunk per worker and verify the chunks in the pool. The chunk results are
+    joined in order, so the result list matches the entries exactly as in verify_signature_entries.
+    '''
+    chunk_size = -(-len(entries) // workers)
+    chunks = [entries[x:x + chunk_size] for x in range(0, len(entries), chunk_size)]
+    results = []
+    for chunk_results in pool.map(verify_signature_chunk, [curve.parameters] * len(chunks), chunks):
+        results.extend(chunk_results)
+    return results
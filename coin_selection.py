@@ -0,0 +1,126 @@
+'''
+Coin selection
+=====
+
+Given a list of spendable output utxos and a target amount, we choose which utxos a Transaction will spend. Every
+input costs a signature verification on each Node, so we prefer selections with fewer inputs.
+
+The utxos are given as (tx_id, tx_index, amount, address) rows, with integer amounts, as in the Wallet UTXOIndex.
+
+We offer two strategies:
+    -Largest first: take the largest utxos until the target is reached. This gives the fewest inputs of any
+    selection, but usually leaves change.
+    -Branch and bound: a depth first search for a selection whose total is exactly the target, so that no change
+    output is needed. Among the exact matches found within the search budget, we return the one with the fewest inputs.
+
+select_coins prefers an exact match from branch and bound, but only one with no more inputs than largest first would
+use. Otherwise it returns the largest first selection.
+'''
+
+'''
+CONSTANTS
+'''
+LARGEST_FIRST = 'largest_first'
+BRANCH_AND_BOUND = 'branch_and_bound'
+
+# Maximum number of search nodes visited by branch and bound
+BNB_MAX_TRIES = 100000
+
+'''
+STRATEGIES
+'''
+
+
+def largest_first(utxos: list, target: int):
+    '''
+    Returns the largest utxos whose total is at least target, or None if the utxos don't cover the target.
+    '''
+    selection = []
+    total = 0
+    for utxo in sorted(utxos, key=lambda row: row[2], reverse=True):
+        if total >= target:
+            break
+        selection.append(utxo)
+        total += utxo[2]
+
+    if total < target:
+        return None
+    return selection
+
+
+def branch_and_bound(utxos: list, target: int, max_tries=BNB_MAX_TRIES, max_inputs=None):
+    '''
+    Returns the selection with the fewest utxos whose total is exactly target, or None if we find no exact match
+    with at most max_inputs utxos within max_tries search nodes.
+
+    We sort the utxos in descending order and walk the inclusion/exclusion tree depth first. A branch is cut when
+        -its total exceeds the target,
+        -its total plus all remaining utxos can't reach the target, or
+        -it can't have fewer utxos than the best selection found so far, or would need more than max_inputs.
+    '''
+    if target <= 0:
+        return []
+
+    ordered = sorted(utxos, key=lambda row: row[2], reverse=True)
+    amounts = [row[2] for row in ordered]
+
+    # remaining[i] is the sum of the amounts from index i onwards
+    remaining = [0] * (len(amounts) + 1)
+    for i in range(len(amounts) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + amounts[i]
+    if remaining[0] < target:
+        return None
+
+    best = None
+    tries = 0
+
+    # Stack of (index, total, selected indices)
+    stack = [(0, 0, [])]
+    while stack and tries < max_tries:
+        index, total, selected = stack.pop()
+        tries += 1
+
+        if total == target:
+            if best is None or len(selected) < len(best):
+                best = selected
+            continue
+        if index == len(amounts) or total + remaining[index] < target:
+            continue
+        limit = max_inputs if best is None else len(best) - 1
+        if limit is not None and len(selected) + 1 > limit:
+            continue
+
+        # Exclusion is pushed first, so that inclusion of the larger utxo is explored first
+        stack.append((index + 1, total, selected))
+        if total + amounts[index] <= target:
+            stack.append((index + 1, total + amounts[index], selected + [index]))
+
+    if best is None:
+        return None
+    return [ordered[i] for i in best]
+
+
+'''
+SELECTION
+'''
+
+
+def select_coins(utxos: list, target: int, strategy=None):
+    '''
+    Returns the list of utxos to spend for the target amount, or None if the utxos don't cover it. With no strategy
+    we take the largest first selection, unless branch and bound finds an exact match with no more inputs, which saves
+    the change output.
+    '''
+    if strategy == LARGEST_FIRST:
+        return largest_first(utxos, target)
+    if strategy == BRANCH_AND_BOUND:
+        return branch_and_bound(utxos, target)
+
+    assert strategy is None, f'Unknown coin selection strategy {strategy}'
+    selection = largest_first(utxos, target)
+    if selection is None:
+        return None
+    exact_match = branch_and_bound(utxos, target, max_inputs=len(selection))
+    if exact_match is not None:
+        return exact_match
+    return selection
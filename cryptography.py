@@ -3,8 +3,45 @@ Methods for ECC cryptography
 '''
 
 '''Imports'''
+import hmac
+import os
 import primefac
 import secrets
+from concurrent.futures import ProcessPoolExecutor
+
+from helpers import LRUCache
+
+# gmpy2 is optional. If it's installed, its mpz integers can be chosen for the field arithmetic.
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+'''Arithmetic Backends'''
+
+PYTHON_BACKEND = 'python'
+GMPY2_BACKEND = 'gmpy2'
+
+ARITHMETIC_BACKENDS = {PYTHON_BACKEND: int}
+if gmpy2 is not None:
+    ARITHMETIC_BACKENDS.update({GMPY2_BACKEND: gmpy2.mpz})
+
+# gmpy2 is opt-in: curves use Python ints unless given a backend or the default is changed
+default_backend = PYTHON_BACKEND
+
+
+def set_default_backend(backend: str):
+    '''
+    Sets the arithmetic backend of any EllipticCurve created afterwards without a backend.
+    '''
+    global default_backend
+    assert backend in ARITHMETIC_BACKENDS, f'Arithmetic backend {backend} unavailable'
+    default_backend = backend
+
+
+def get_default_backend() -> str:
+    return default_backend
+
 
 '''Mathematical Methods'''
 
@@ -24,21 +61,56 @@ def generate_nbit_prime(n: int):
     return num
 
 
-def legendre_symbol(n: int, p: int) -> int:
+def legendre_symbol(n: int, p: int, number=int) -> int:
     '''
-    Returns 0 if p | n and a^(p-1)/2 % p otherwise
+    Returns 0 if p | n, 1 if n is a quadratic residue mod p and -1 otherwise. We use Euler's criterion, where
+    n^(p-1)/2 = p - 1 (mod p) for a non-residue. The arithmetic uses the given number type, e.g. the number of a curve.
     '''
+    n, p = number(n), number(p)
     if n % p == 0:
         return 0
-    return pow(n, (p - 1) // 2, p)
+    return 1 if pow(n, (p - 1) // 2, p) == 1 else -1
+
 
+def batch_inverse(values: list, modulus: int) -> list:
+    '''
+    Returns the list of inverses of the given values modulo the prime modulus, using Montgomery's trick:
+
+        1) Compute the running products c_i = v_1 * ... * v_i
+        2) Invert the final product once
+        3) Walk back down the list, using c_(i-1) * (c_i)^(-1) = v_i^(-1) and v_i * (c_i)^(-1) = (c_(i-1))^(-1)
+
+    Hence N inverses cost a single modular inversion and 3(N-1) multiplications. All values must be invertible.
+    '''
+    if not values:
+        return []
+
+    # 1) Running products
+    products = [values[0] % modulus]
+    for v in values[1:]:
+        products.append((products[-1] * v) % modulus)
+
+    # 2) Single inversion
+    inv = pow(products[-1], -1, modulus)
+
+    # 3) Recover the individual inverses
+    inverses = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        inverses[i] = (inv * products[i - 1]) % modulus
+        inv = (inv * values[i]) % modulus
+    inverses[0] = inv
+    return inverses
 
-def tonelli_shanks(n: int, p: int):
+
+def tonelli_shanks(n: int, p: int, number=int):
     '''
-    If n is a quadratic residue mod p, then we return an integer r such that r^2 = n (mod p).
+    If n is a quadratic residue mod p, then we return an integer r such that r^2 = n (mod p). The arithmetic uses the
+    given number type, e.g. the number of a curve.
     '''
+    n, p = number(n), number(p)
+
     '''Verify n is a QR'''
-    if legendre_symbol(n, p) == -1:
+    if legendre_symbol(n, p, number) == -1:
         return None
 
     '''Trivial case'''
@@ -47,7 +119,7 @@ def tonelli_shanks(n: int, p: int):
 
     '''p = 3 (mod 4) case'''
     if p % 4 == 3:
-        return pow(n, (p + 1) // 4, p)
+        return int(pow(n, (p + 1) // 4, p))
 
     '''General case'''
     # 1) Divide p-1 into its even and odd components by p-1 = 2^s * Q, where Q is odd and s >=1
@@ -59,7 +131,7 @@ def tonelli_shanks(n: int, p: int):
 
     # 2) Find a quadratic non residue
     z = 2
-    while legendre_symbol(z, p) != 1:
+    while legendre_symbol(z, p, number) != -1:
         z += 1
 
     # 3) Configure initial variables
@@ -88,7 +160,109 @@ def tonelli_shanks(n: int, p: int):
         t = (t * b * b) % p
         R = (R * b) % p
 
-    return R
+    return int(R)
+
+
+'''Deterministic Nonces'''
+
+
+def rfc6979_nonces(private_key: int, tx_hash: str, order: int):
+    '''
+    Yields the nonce candidates k in [1, order-1] of RFC 6979 (section 3.2) using HMAC-SHA256, derived from the private
+    key and the transaction hash. The same key and hash always give the same sequence, so signing needs no randomness.
+    The first candidate is the nonce, and we only ask for the next one if the signature has r = 0 or s = 0.
+    '''
+    qlen = order.bit_length()
+    rlen = (qlen + 7) // 8
+
+    def bits2int(b: bytes) -> int:
+        return int.from_bytes(b, 'big') >> max(0, 8 * len(b) - qlen)
+
+    def int2octets(x: int) -> bytes:
+        return x.to_bytes(rlen, 'big')
+
+    def mac(key: bytes, data: bytes) -> bytes:
+        return hmac.new(key, data, 'sha256').digest()
+
+    # Private key and reduced hash as octet strings
+    x = int2octets(private_key)
+    h1 = int(tx_hash, 16).to_bytes(32, 'big')
+    h = int2octets(bits2int(h1) % order)
+
+    # Initial K and V
+    V = b'\x01' * 32
+    K = b'\x00' * 32
+    K = mac(K, V + b'\x00' + x + h)
+    V = mac(K, V)
+    K = mac(K, V + b'\x01' + x + h)
+    V = mac(K, V)
+
+    # Generate candidates
+    while True:
+        T = b''
+        while len(T) < rlen:
+            V = mac(K, V)
+            T += V
+        k = bits2int(T)
+        if 1 <= k < order:
+            yield k
+        K = mac(K, V + b'\x00')
+        V = mac(K, V)
+
+
+'''Point Counting'''
+
+
+def count_points_chunk(a: int, b: int, p: int, start: int, stop: int) -> int:
+    '''
+    Returns the number of points (x,y) on y^2 = x^3 + ax + b (mod p) with start <= x < stop. Each x contributes
+    1 + legendre_symbol(x^3 + ax + b, p) points.
+    '''
+    count = 0
+    for x in range(start, stop):
+        count += 1 + legendre_symbol(x ** 3 + a * x + b, p)
+    return count
+
+
+def count_points_vectorized(a: int, b: int, p: int, chunk_size: int = pow(2, 20)) -> int:
+    '''
+    Returns the number of points (x,y) on y^2 = x^3 + ax + b (mod p), for p small enough that all of F_p fits in
+    memory.
+
+    We precompute the quadratic residues once by squaring every y in [1, (p-1)/2], then look up x^3 + ax + b for
+    chunks of x values. A residue has two roots, 0 has one and a non-residue has none.
+    '''
+    # numpy is only needed here, so we import it when counting rather than with the module
+    import numpy as np
+
+    assert p < pow(2, 31)  # Products of two residues must fit in an int64
+    a, b = a % p, b % p
+
+    # Quadratic residues
+    residues = np.zeros(p, dtype=bool)
+    for start in range(1, (p + 1) // 2, chunk_size):
+        y = np.arange(start, min(start + chunk_size, (p + 1) // 2), dtype=np.int64)
+        residues[(y * y) % p] = True
+
+    # Number of roots for each x
+    count = 0
+    for start in range(0, p, chunk_size):
+        x = np.arange(start, min(start + chunk_size, p), dtype=np.int64)
+        val = ((x * x) % p * x % p + a * x % p + b) % p
+        count += 2 * int(np.count_nonzero(residues[val])) + int(np.count_nonzero(val == 0))
+    return count
+
+
+def count_points_parallel(a: int, b: int, p: int, workers: int) -> int:
+    '''
+    Returns the number of points (x,y) on y^2 = x^3 + ax + b (mod p), splitting F_p into chunks which are
+    counted in separate processes.
+    '''
+    chunk_count = 4 * workers
+    bounds = [p * i // chunk_count for i in range(chunk_count + 1)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(count_points_chunk, a, b, p, bounds[i], bounds[i + 1]) for i in range(chunk_count)]
+        return sum(future.result() for future in futures)
 
 
 '''Elliptic Curve class'''
@@ -116,7 +290,36 @@ class EllipticCurve:
                          0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8)
     BITCOIN_GROUPORDER = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
 
-    def __init__(self, a=None, b=None, p=None, generator=None, order=None):
+    # Fixed-base tables for the generator, shared by every curve with the same parameters
+    GENERATOR_WINDOW_BITS = 8
+    generator_tables = {}
+
+    # Window size for interleaved multi-scalar multiplication
+    STRAUS_WINDOW_BITS = 4
+
+    # GLV endomorphism constants for the Bitcoin curve
+    GLV_BETA = 0x7ae96a2b657c07106e64479eac3434e99cf0497512f58995c1396c28719501ee
+    GLV_LAMBDA = 0x5363ad4cc05c30e0a5261c028812645a122e22ea20816678df02967c1b23bd72
+    GLV_A1 = 0x3086d221a7d46bcde86c90e49284eb15
+    GLV_B1 = -0xe4437ed6010e88286f547fa90abfe4c3
+    GLV_A2 = 0x114ca50f7a8e2f3f657c1108d9d44cfd8
+    GLV_B2 = 0x3086d221a7d46bcde86c90e49284eb15
+
+    # Primality of group orders, shared by every curve
+    prime_orders = {}
+
+    # Validation levels
+    VALIDATION_FULL = 'full'
+    VALIDATION_FAST = 'fast'
+
+    # Number of recovered public key points we keep
+    PUBLIC_KEY_CACHE_SIZE = 1024
+
+    # Largest prime for which we count points with numpy
+    VECTORIZED_ORDER_LIMIT = pow(2, 24)
+
+    def __init__(self, a=None, b=None, p=None, generator=None, order=None, validation=None,
+                 public_key_cache_size=PUBLIC_KEY_CACHE_SIZE, backend=None):
         '''
         We instantiate an elliptic curve E of the form
 
@@ -126,6 +329,18 @@ class EllipticCurve:
         order of the corresponding finite abelian group. Further, for p sufficiently small we attach a random
         generator as class variable - and for p sufficiently large we use the BITCOIN values.
 
+        The validation level determines how often we verify that points lie on the curve. With VALIDATION_FULL (the
+        default) every intermediate point is checked, which is what we want for testing. With VALIDATION_FAST we only
+        check the points handed to us at the API boundaries - the inputs of scalar_multiplication,
+        multi_scalar_multiplication, verify_signature and the point returned by get_public_key_point.
+
+        The public_key_cache_size is the number of compressed keys whose point we keep, so that repeated spends from
+        the same address skip the square root.
+
+        The backend determines the integer type used for the field arithmetic - Python ints unless another backend is
+        given or set as the default, e.g. gmpy2 if it's installed. The curve parameters and every point returned by the
+        curve are always Python ints.
+
         '''
         # Linear coefficient
         if a is None:
@@ -157,6 +372,29 @@ class EllipticCurve:
         else:
             self.order = order
 
+        # Validation level
+        if validation is None:
+            self.validation = self.VALIDATION_FULL
+        else:
+            assert validation in [self.VALIDATION_FULL, self.VALIDATION_FAST]
+            self.validation = validation
+
+        # Recovered public key points
+        self.public_key_cache = LRUCache(public_key_cache_size)
+
+        # Arithmetic backend
+        if backend is None:
+            self.backend = default_backend
+        else:
+            assert backend in ARITHMETIC_BACKENDS, f'Arithmetic backend {backend} unavailable'
+            self.backend = backend
+        self.number = ARITHMETIC_BACKENDS[self.backend]
+
+        # Curve values in the arithmetic backend
+        self.field_a = self.number(self.a)
+        self.field_b = self.number(self.b)
+        self.field_p = self.number(self.p)
+
     '''
     Properties
     '''
@@ -171,7 +409,40 @@ class EllipticCurve:
 
     @property
     def has_prime_order(self):
-        return primefac.isprime(self.order)
+        is_prime = self.prime_orders.get(self.order)
+        if is_prime is None:
+            is_prime = primefac.isprime(self.order)
+            self.prime_orders.update({self.order: is_prime})
+        return is_prime
+
+    @property
+    def full_validation(self):
+        return self.validation == self.VALIDATION_FULL
+
+    @property
+    def has_endomorphism(self):
+        '''
+        The Bitcoin curve has an efficiently computable endomorphism, which we use to halve the number of doublings
+        in scalar multiplication.
+        '''
+        return self.a == 0 and self.b == 7 and self.p == self.BITCOIN_PRIME and self.order == self.BITCOIN_GROUPORDER
+
+    @property
+    def parameters(self):
+        return self.a, self.b, self.p, self.generator, self.order
+
+    @property
+    def generator_table(self):
+        '''
+        The fixed-base table for the generator. It is built on first use and cached at the class level, keyed by the
+        backend and curve parameters.
+        '''
+        key = (self.backend, self.parameters)
+        table = self.generator_tables.get(key)
+        if table is None:
+            table = self.build_generator_table()
+            self.generator_tables.update({key: table})
+        return table
 
     '''
     Methods
@@ -202,21 +473,26 @@ class EllipticCurve:
                     generator_found = True
             return candidate_point
 
-    def find_group_order(self):
+    def find_group_order(self, workers=None):
         '''
         Using the legendre symbol addition formula
 
-        E(F_p) = sum_{x in F_p} ( (x^3 + ax + b) | p )
+        E(F_p) = p + 1 + sum_{x in F_p} ( (x^3 + ax + b) | p )
 
-        where the right most term is the Legendre symbol
-        '''
+        where the right most term is the Legendre symbol. Equivalently, the order is the number of affine points plus
+        the point at infinity.
 
-        sum = 0
-        for x in range(0, self.p):
-            val = x ** 3 + self.a * x + self.b
-            sum += legendre_symbol(val, self.p)
+        For p below VECTORIZED_ORDER_LIMIT we count the points with numpy. For larger p we split F_p across workers
+        processes - by default one per cpu - or count serially if workers = 1.
+        '''
+        if self.p < self.VECTORIZED_ORDER_LIMIT:
+            return count_points_vectorized(self.a, self.b, self.p) + 1
 
-        return sum + self.p + 1
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers > 1:
+            return count_points_parallel(self.a, self.b, self.p, workers) + 1
+        return count_points_chunk(self.a, self.b, self.p, 0, self.p) + 1
 
     def find_integer_point(self):
         '''
@@ -239,19 +515,25 @@ class EllipticCurve:
         '''
         Using tonelli shanks, we return y such that E(x,y) = 0, if x is on the curve.
         Note that if (x,y) is a point then (x,p-y) will be a point as well.
+
+        With fast validation we skip the legendre symbol and instead check that y^2 = x^3 + ax + b once we have y.
         '''
 
         # Verify x is on the curve
-        assert self.is_x_on_curve(x)
+        if self.full_validation:
+            assert self.is_x_on_curve(x)
 
         # Find the two possible y values
-        val = (x ** 3 + self.a * x + self.b) % self.p
-        y = tonelli_shanks(val, self.p)
-        neg_y = -y % self.p
+        val = (x ** 3 + self.field_a * x + self.field_b) % self.field_p
+        y = tonelli_shanks(val, self.field_p, self.number)
 
         # Check y values
-        assert self.is_on_curve((x, y))
-        assert self.add_points((x, y), (x, neg_y)) is None
+        if self.full_validation:
+            neg_y = -y % self.field_p
+            assert self.is_on_curve((x, y))
+            assert self.add_points((x, y), (x, neg_y)) is None
+        else:
+            assert y is not None and (y * y - val) % self.field_p == 0
 
         # Return y
         return y
@@ -271,7 +553,7 @@ class EllipticCurve:
 
         # General Case
         x, y = point
-        return (x ** 3 - y ** 2 + self.a * x + self.b) % self.p == 0
+        return (x ** 3 - y ** 2 + self.field_a * x + self.field_b) % self.field_p == 0
 
     def is_x_on_curve(self, x: int) -> bool:
         '''
@@ -280,14 +562,14 @@ class EllipticCurve:
         '''
 
         # Get value
-        val = x ** 3 + self.a * x + self.b
+        val = x ** 3 + self.field_a * x + self.field_b
 
         # Trivial case
-        if val % self.p == 0:
+        if val % self.field_p == 0:
             return True
 
         # General case
-        return legendre_symbol(val, self.p) == 1
+        return legendre_symbol(val, self.field_p, self.number) == 1
 
     '''
     Group Operations
@@ -299,8 +581,9 @@ class EllipticCurve:
         '''
 
         # Verify points exist
-        assert self.is_on_curve(point1)
-        assert self.is_on_curve(point2)
+        if self.full_validation:
+            assert self.is_on_curve(point1)
+            assert self.is_on_curve(point2)
 
         # Point at infinity cases
         if point1 is None:
@@ -319,24 +602,27 @@ class EllipticCurve:
             elif y1 == 0:  # Point is its own inverse when lying on the x axis
                 return None
             else:  # Points are the same
-                m = ((3 * x1 * x1 + self.a) * pow(2 * y1, -1, self.p)) % self.p
+                m = ((3 * x1 * x1 + self.field_a) * pow(2 * y1, -1, self.field_p)) % self.field_p
         else:  # Points are distinct
-            m = ((y2 - y1) * pow(x2 - x1, -1, self.p)) % self.p
+            m = ((y2 - y1) * pow(x2 - x1, -1, self.field_p)) % self.field_p
 
         # Use the addition formulas
-        x3 = (m * m - x1 - x2) % self.p
-        y3 = (m * (x1 - x3) - y1) % self.p
-        point = (x3, y3)
+        x3 = (m * m - x1 - x2) % self.field_p
+        y3 = (m * (x1 - x3) - y1) % self.field_p
+        point = self.from_field((x3, y3))
 
         # Verify result
-        assert self.is_on_curve(point)
+        if self.full_validation:
+            assert self.is_on_curve(point)
 
         # Return sum of points
         return point
 
     def scalar_multiplication(self, n: int, point: tuple):
         '''
-        We use the double-and-add algorithm to add a point P with itself n times.
+        We use the double-and-add algorithm to add a point P with itself n times. The doublings and additions are
+        done in Jacobian coordinates, so that no modular inversion is needed until the final conversion back to an
+        affine point.
 
         Algorithm:
         ---------
@@ -360,6 +646,9 @@ class EllipticCurve:
         if point is None:
             return None
 
+        # Verify point
+        assert self.is_on_curve(point)
+
         # Scalar multiple divides group order
         if n % self.order == 0:
             return None
@@ -367,21 +656,442 @@ class EllipticCurve:
         # Take residue of n modulo the group order
         n = n % self.order
 
+        # Use the precomputed table for the generator
+        if point == self.generator:
+            result = self.fixed_base_multiplication(n)
+            if self.full_validation:
+                assert self.is_on_curve(result)
+            return result
+
+        # Use the endomorphism if the curve has one
+        if self.has_endomorphism:
+            return self.multi_scalar_multiplication([n], [point])
+
         # Proceed with algorithm
+        point = self.to_field(point)
         bitstring = bin(n)[2:]
-        temp_point = point
+        temp_point = self.to_jacobian(point)
         for x in range(1, len(bitstring)):
-            temp_point = self.add_points(temp_point, temp_point)  # Double regardless of bit
-            bit = int(bitstring[x:x + 1], 2)
-            if bit == 1:
-                temp_point = self.add_points(temp_point, point)  # Add to the doubling if bit == 1
+            temp_point = self.double_jacobian(temp_point)  # Double regardless of bit
+            if bitstring[x] == '1':
+                temp_point = self.add_jacobian_affine(temp_point, point)  # Add to the doubling if bit == 1
+            if self.full_validation:
+                assert self.is_on_curve_jacobian(temp_point)
 
-        # Verify results
-        assert self.is_on_curve(temp_point)
+        # Convert back to affine coordinates and verify results
+        result = self.from_field(self.to_affine(temp_point))
+        if self.full_validation:
+            assert self.is_on_curve(result)
 
         # Return point
+        return result
+
+    def affine_scalar_multiplication(self, n: int, point: tuple):
+        '''
+        The double-and-add algorithm using only affine point addition. Every step costs a modular inversion,
+        so this is only kept as a reference implementation for scalar_multiplication.
+        '''
+
+        # Point at infinity case
+        if point is None:
+            return None
+
+        # Scalar multiple divides group order
+        if n % self.order == 0:
+            return None
+
+        # Proceed with algorithm
+        bitstring = bin(n % self.order)[2:]
+        temp_point = point
+        for x in range(1, len(bitstring)):
+            temp_point = self.add_points(temp_point, temp_point)
+            if bitstring[x] == '1':
+                temp_point = self.add_points(temp_point, point)
+
+        return temp_point
+
+    '''
+    Fixed-Base Multiplication
+    '''
+
+    def build_generator_table(self):
+        '''
+        We break a scalar into windows of w = GENERATOR_WINDOW_BITS bits, so that
+
+            n = sum_i d_i * 2^(w*i),    0 <= d_i < 2^w
+
+        For each window i we store the affine points d * 2^(w*i) * G for every digit d, with the point at infinity at
+        index 0. Then n * G is the sum of one table entry per window, and no doublings are needed. Each row is
+        computed in Jacobian coordinates, along with the base of the next row, and normalized with a single inversion.
+        '''
+        w = self.GENERATOR_WINDOW_BITS
+        window_count = -(-self.order.bit_length() // w)
+
+        table = []
+        base = self.to_field(self.generator)
+        for i in range(window_count):
+            jacobian_row = []
+            temp_point = self.to_jacobian(base)
+            for d in range(2, pow(2, w)):
+                temp_point = self.add_jacobian_affine(temp_point, base)
+                jacobian_row.append(temp_point)
+
+            # Next base is 2^w times the current base
+            temp_point = self.to_jacobian(base)
+            for _ in range(w):
+                temp_point = self.double_jacobian(temp_point)
+            jacobian_row.append(temp_point)
+
+            affine_row = self.normalize_points(jacobian_row)
+            table.append([None, base] + affine_row[:-1])
+            base = affine_row[-1]
+
+        return table
+
+    def fixed_base_multiplication(self, n: int):
+        '''
+        Returns n * G using the generator table.
+        '''
+        return self.from_field(self.to_affine(self.fixed_base_jacobian(n)))
+
+    def batch_fixed_base_multiplication(self, scalars: list) -> list:
+        '''
+        Returns the list of n * G for each n in scalars, using a single inversion to convert the results to affine
+        coordinates. Used to generate keys and signature nonces in bulk.
+        '''
+        jacobian_points = [self.fixed_base_jacobian(n) for n in scalars]
+        return [self.from_field(point) for point in self.normalize_points(jacobian_points)]
+
+    def fixed_base_jacobian(self, n: int):
+        '''
+        Returns n * G as a Jacobian point. We read n in w-bit windows starting with the least significant, and add
+        the corresponding table entry for each non-zero window.
+        '''
+        w = self.GENERATOR_WINDOW_BITS
+        mask = pow(2, w) - 1
+        table = self.generator_table
+
+        n = n % self.order
+        temp_point = None
+        i = 0
+        while n > 0:
+            d = n & mask
+            if d != 0:
+                temp_point = self.add_jacobian_affine(temp_point, table[i][d])
+            n >>= w
+            i += 1
+
         return temp_point
 
+    '''
+    Multi-Scalar Multiplication
+    '''
+
+    def multi_scalar_multiplication(self, scalars: list, points: list):
+        '''
+        Returns the sum n_1 * P_1 + ... + n_k * P_k without computing each product separately.
+
+        Any multiples of the generator are collected and computed using the generator table. The remaining points
+        are interleaved using Straus' method: we precompute the multiples d * P_j for every w-bit digit d, then read
+        all scalars from the most significant window down. Each window costs w doublings, which are shared by all
+        points, and one addition per point with a non-zero digit.
+        '''
+        result = self.from_field(self.to_affine(self.multi_scalar_jacobian(scalars, points)))
+        if self.full_validation:
+            assert self.is_on_curve(result)
+        return result
+
+    def multi_scalar_jacobian(self, scalars: list, points: list):
+        '''
+        The multi-scalar multiplication, returning the sum as a Jacobian point.
+        '''
+        assert len(scalars) == len(points)
+
+        # Split off the generator terms and the trivial terms
+        generator_scalar = 0
+        straus_scalars = []
+        straus_points = []
+        for n, point in zip(scalars, points):
+            n = n % self.order
+            if point is None or n == 0:
+                continue
+            assert self.is_on_curve(point)
+            if point == self.generator:
+                generator_scalar += n
+            else:
+                straus_scalars.append(n)
+                straus_points.append(self.to_field(point))
+
+        # Generator multiple
+        temp_point = self.fixed_base_jacobian(generator_scalar)
+        if not straus_points:
+            return temp_point
+
+        # Split each term in two half-size terms using the endomorphism, if the curve has one
+        if self.has_endomorphism:
+            glv_scalars = []
+            glv_points = []
+            for n, point in zip(straus_scalars, straus_points):
+                k1, k2 = self.glv_decomposition(n)
+                for k, glv_point in [(k1, point), (k2, self.endomorphism(point))]:
+                    if k < 0:
+                        k = -k
+                        glv_point = self.negate_point(glv_point)
+                    if k != 0:
+                        glv_scalars.append(k)
+                        glv_points.append(glv_point)
+            straus_scalars, straus_points = glv_scalars, glv_points
+
+        # Return the sum of both parts
+        return self.add_jacobian(temp_point, self.straus_jacobian(straus_scalars, straus_points))
+
+    def straus_jacobian(self, scalars: list, points: list):
+        '''
+        Interleaves the non-negative scalars using Straus' method and returns the sum as a Jacobian point. The scalars
+        are not reduced by the group order.
+        '''
+        if not points:
+            return None
+
+        # Precompute d * P for every digit d
+        w = self.STRAUS_WINDOW_BITS
+        mask = pow(2, w) - 1
+        tables = []
+        for point in points:
+            row = [None, self.to_jacobian(point)]
+            for d in range(2, pow(2, w)):
+                row.append(self.add_jacobian_affine(row[-1], point))
+            tables.append(row)
+
+        # Interleave the scalars, starting with the most significant window
+        straus_point = None
+        window_count = -(-max(scalars).bit_length() // w)
+        for i in range(window_count - 1, -1, -1):
+            for _ in range(w):
+                straus_point = self.double_jacobian(straus_point)
+            shift = w * i
+            for n, row in zip(scalars, tables):
+                d = (n >> shift) & mask
+                if d != 0:
+                    straus_point = self.add_jacobian(straus_point, row[d])
+            if self.full_validation:
+                assert self.is_on_curve_jacobian(straus_point)
+
+        return straus_point
+
+    '''
+    GLV Endomorphism
+    '''
+
+    def endomorphism(self, point: tuple):
+        '''
+        On the Bitcoin curve, the map (x, y) -> (beta * x, y) is the same as scalar multiplication by lambda, where beta
+        and lambda are cube roots of unity mod p and mod n respectively.
+        '''
+        if point is None:
+            return None
+        x, y = point
+        return ((self.GLV_BETA * x) % self.field_p, y)
+
+    def negate_point(self, point: tuple):
+        if point is None:
+            return None
+        x, y = point
+        return (x, -y % self.field_p)
+
+    def glv_decomposition(self, k: int):
+        '''
+        We write k = k1 + k2 * lambda (mod n) with |k1|, |k2| of roughly half the bit length of n. Using the short
+        basis vectors (a1, b1) and (a2, b2) of the lattice {(x, y) : x + y * lambda = 0 (mod n)}, we let
+
+            c1 = round(b2 * k / n), c2 = round(-b1 * k / n)
+            k1 = k - c1 * a1 - c2 * a2, k2 = -c1 * b1 - c2 * b2
+        '''
+        n = self.order
+        c1 = (2 * self.GLV_B2 * k + n) // (2 * n)
+        c2 = (-2 * self.GLV_B1 * k + n) // (2 * n)
+        k1 = k - c1 * self.GLV_A1 - c2 * self.GLV_A2
+        k2 = -c1 * self.GLV_B1 - c2 * self.GLV_B2
+        return k1, k2
+
+    '''
+    Backend Conversion
+    '''
+
+    def to_field(self, point: tuple):
+        '''
+        Returns the affine point with coordinates in the arithmetic backend.
+        '''
+        if point is None:
+            return None
+        x, y = point
+        return (self.number(x), self.number(y))
+
+    def from_field(self, point: tuple):
+        '''
+        Returns the affine point with Python int coordinates.
+        '''
+        if point is None:
+            return None
+        x, y = point
+        return (int(x), int(y))
+
+    '''
+    Jacobian Coordinates
+    '''
+
+    def to_jacobian(self, point: tuple):
+        '''
+        The affine point (x,y) corresponds to the Jacobian point (X, Y, Z) = (x, y, 1). In general, the Jacobian point
+        (X, Y, Z) represents the affine point (X/Z^2, Y/Z^3). We use None for the point at infinity in both systems.
+        '''
+        if point is None:
+            return None
+        x, y = point
+        return (x, y, 1)
+
+    def to_affine(self, jacobian_point: tuple):
+        '''
+        Returns the affine point (X/Z^2, Y/Z^3) using a single modular inversion.
+        '''
+        if jacobian_point is None:
+            return None
+        X, Y, Z = jacobian_point
+        z_inv = pow(Z, -1, self.field_p)
+        z_inv2 = (z_inv * z_inv) % self.field_p
+        return ((X * z_inv2) % self.field_p, (Y * z_inv2 * z_inv) % self.field_p)
+
+    def normalize_points(self, jacobian_points: list) -> list:
+        '''
+        Returns the list of affine points corresponding to the given Jacobian points. We invert all the Z values at
+        once using batch_inverse, so N conversions cost a single inversion. The point at infinity stays None.
+        '''
+        z_values = [point[2] for point in jacobian_points if point is not None]
+        z_inverses = iter(batch_inverse(z_values, self.field_p))
+
+        affine_points = []
+        for point in jacobian_points:
+            if point is None:
+                affine_points.append(None)
+                continue
+            X, Y, _ = point
+            z_inv = next(z_inverses)
+            z_inv2 = (z_inv * z_inv) % self.field_p
+            affine_points.append(((X * z_inv2) % self.field_p, (Y * z_inv2 * z_inv) % self.field_p))
+        return affine_points
+
+    def is_on_curve_jacobian(self, jacobian_point: tuple) -> bool:
+        '''
+        The Jacobian form of the curve equation is Y^2 = X^3 + aXZ^4 + bZ^6 (mod p)
+        '''
+        if jacobian_point is None:
+            return True
+        X, Y, Z = jacobian_point
+        z2 = (Z * Z) % self.field_p
+        z4 = (z2 * z2) % self.field_p
+        return (X * X * X + self.field_a * X * z4 + self.field_b * z4 * z2 - Y * Y) % self.field_p == 0
+
+    def double_jacobian(self, jacobian_point: tuple):
+        '''
+        Doubles a Jacobian point without inversion:
+            S = 4XY^2, M = 3X^2 + aZ^4
+            X' = M^2 - 2S, Y' = M(S - X') - 8Y^4, Z' = 2YZ
+        '''
+        if jacobian_point is None:
+            return None
+        X, Y, Z = jacobian_point
+
+        # Point is its own inverse when lying on the x axis
+        if Y % self.field_p == 0:
+            return None
+
+        p = self.field_p
+        yy = (Y * Y) % p
+        s = (4 * X * yy) % p
+        m = 3 * X * X
+        if self.field_a != 0:
+            zz = (Z * Z) % p
+            m += self.field_a * zz * zz
+        m %= p
+        x3 = (m * m - 2 * s) % p
+        y3 = (m * (s - x3) - 8 * yy * yy) % p
+        z3 = (2 * Y * Z) % p
+        return (x3, y3, z3)
+
+    def add_jacobian(self, jacobian_point1: tuple, jacobian_point2: tuple):
+        '''
+        Adds two Jacobian points without inversion:
+            U1 = X1*Z2^2, U2 = X2*Z1^2, S1 = Y1*Z2^3, S2 = Y2*Z1^3, H = U2 - U1, R = S2 - S1
+            X3 = R^2 - H^3 - 2*U1*H^2, Y3 = R(U1*H^2 - X3) - S1*H^3, Z3 = H*Z1*Z2
+        '''
+        # Point at infinity cases
+        if jacobian_point1 is None:
+            return jacobian_point2
+        if jacobian_point2 is None:
+            return jacobian_point1
+
+        p = self.field_p
+        X1, Y1, Z1 = jacobian_point1
+        X2, Y2, Z2 = jacobian_point2
+
+        z1z1 = (Z1 * Z1) % p
+        z2z2 = (Z2 * Z2) % p
+        u1 = (X1 * z2z2) % p
+        u2 = (X2 * z1z1) % p
+        s1 = (Y1 * Z2 * z2z2) % p
+        s2 = (Y2 * Z1 * z1z1) % p
+
+        # Same x coordinate - either the points are inverses or they're the same
+        if u1 == u2:
+            if s1 != s2:
+                return None
+            return self.double_jacobian(jacobian_point1)
+
+        h = (u2 - u1) % p
+        r = (s2 - s1) % p
+        hh = (h * h) % p
+        hhh = (h * hh) % p
+        v = (u1 * hh) % p
+        x3 = (r * r - hhh - 2 * v) % p
+        y3 = (r * (v - x3) - s1 * hhh) % p
+        z3 = (Z1 * Z2 * h) % p
+        return (x3, y3, z3)
+
+    def add_jacobian_affine(self, jacobian_point: tuple, point: tuple):
+        '''
+        Adds an affine point to a Jacobian point. This is add_jacobian with Z2 = 1, which saves several
+        multiplications in the double-and-add loop.
+        '''
+        # Point at infinity cases
+        if point is None:
+            return jacobian_point
+        if jacobian_point is None:
+            return self.to_jacobian(point)
+
+        p = self.field_p
+        X1, Y1, Z1 = jacobian_point
+        x2, y2 = point
+
+        z1z1 = (Z1 * Z1) % p
+        u2 = (x2 * z1z1) % p
+        s2 = (y2 * Z1 * z1z1) % p
+
+        # Same x coordinate - either the points are inverses or they're the same
+        if X1 == u2:
+            if Y1 != s2:
+                return None
+            return self.double_jacobian(jacobian_point)
+
+        h = (u2 - X1) % p
+        r = (s2 - Y1) % p
+        hh = (h * h) % p
+        hhh = (h * hh) % p
+        v = (X1 * hh) % p
+        x3 = (r * r - hhh - 2 * v) % p
+        y3 = (r * (v - x3) - Y1 * hhh) % p
+        z3 = (Z1 * h) % p
+        return (x3, y3, z3)
+
     '''
     Verify Signature
     '''
@@ -400,7 +1110,8 @@ class EllipticCurve:
         2) Let Z be the integer value of the first n BITS of the transaction hash
         3) Let u1 = Z * s^(-1) (mod n) and u2 = r * s^(-1) (mod n)
         4) Calculate the curve point (x,y) = (u1 * generator) + (u2 * public_key)
-            (where * is scalar multiplication, and + is rational point addition mod p)
+            (where * is scalar multiplication, and + is rational point addition mod p). We compute both products
+            in a single multi-scalar multiplication.
         5) If r = x (mod n), the signature is valid.
         '''
 
@@ -420,8 +1131,7 @@ class EllipticCurve:
         u2 = (r * s_inv) % n
 
         # 4) Calculate the point
-        point = self.add_points(self.scalar_multiplication(u1, self.generator),
-                                self.scalar_multiplication(u2, public_key_point))
+        point = self.multi_scalar_multiplication([u1, u2], [self.generator, public_key_point])
 
         # 5) Return True/False based on x. Account for point at infinity.
         if point is None:
@@ -429,15 +1139,70 @@ class EllipticCurve:
         x, y = point
         return r == x % n
 
+    def verify_signatures_batch(self, entries: list) -> list:
+        '''
+        Given a list of (signature, tx_hash, public_key_point) triples, we return a list of True/False values, one for
+        each triple, following the same algorithm as verify_signature. Invalid entries are reported as False rather
+        than raising, so that the caller can find which entries failed.
+
+        The work shared across the batch is:
+            -All the s^(-1) (mod n) values are computed with a single inversion
+            -Every u1 * generator uses the shared generator table
+            -We never convert the resulting point (X, Y, Z) back to affine coordinates. As x = X/Z^2, we have that
+            r = x (mod n) iff X = (r + kn) * Z^2 (mod p) for some k >= 0 with r + kn < p.
+        '''
+        assert self.has_prime_order
+        n = self.order
+        results = [False] * len(entries)
+
+        # 1) Verify the values and get the entries we need to check
+        indices = []
+        for index, (signature, tx_hash, public_key_point) in enumerate(entries):
+            r, s = signature
+            if 1 <= r <= n - 1 and 1 <= s <= n - 1 and public_key_point is not None \
+                    and self.is_on_curve(public_key_point):
+                indices.append(index)
+
+        # 2) Calculate all s^(-1) at once
+        s_inverses = batch_inverse([entries[index][0][1] for index in indices], n)
+
+        for index, s_inv in zip(indices, s_inverses):
+            (r, s), tx_hash, public_key_point = entries[index]
+
+            # 3) Take the first n bits of the transaction hash and calculate u1 and u2
+            Z = int(bin(int(tx_hash, 16))[2:2 + n], 2)
+            u1 = (Z * s_inv) % n
+            u2 = (r * s_inv) % n
+
+            # 4) Calculate the Jacobian point. Account for point at infinity.
+            jacobian_point = self.multi_scalar_jacobian([u1, u2], [self.generator, public_key_point])
+            if jacobian_point is None:
+                continue
+
+            # 5) Compare x with r without converting to affine
+            X, _, jacobian_z = jacobian_point
+            zz = (jacobian_z * jacobian_z) % self.field_p
+            candidate = r
+            while candidate < self.field_p and not results[index]:
+                results[index] = (candidate * zz - X) % self.field_p == 0
+                candidate += n
+
+        return results
+
     '''
     Recover Point
     '''
 
     def get_public_key_point(self, compressed_key: str):
         '''
-        We retrieve the public key point from the compressed key
+        We retrieve the public key point from the compressed key. Recovered points are kept in the public key cache.
         '''
 
+        # 0 - Check the cache
+        point = self.public_key_cache.get(compressed_key)
+        if point is not None:
+            return point
+
         # 1 - Get the parity of y and the x integer value
         parity = int(compressed_key[:2], 16)
         x_int = int(compressed_key[2:], 16)
@@ -450,7 +1215,9 @@ class EllipticCurve:
             y_int = self.p - y_int
 
         # 4 - Verify the point
-        assert self.is_on_curve((x_int, y_int))
+        point = (x_int, y_int)
+        assert self.is_on_curve(point)
 
-        # 5 - Return point
-        return (x_int, y_int)
+        # 5 - Cache and return point
+        self.public_key_cache.put(compressed_key, point)
+        return point
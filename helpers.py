@@ -6,6 +6,8 @@ Various helper functions I don't know where else to put.
 IMPORTS
 '''
 import datetime
+import threading
+from collections import OrderedDict
 from hashlib import sha256
 
 '''
@@ -20,11 +22,14 @@ BASE58_LIST = ['1', '2', '3', '4', '5', '6', '7', '8', '9',
                'w', 'x', 'y', 'z']
 
 
+BASE58_INDEX = {c: i for i, c in enumerate(BASE58_LIST)}
+
+
 def int_to_base58(num: int) -> str:
     '''
-    Explanation here
+    We read off the base58 digits of num from least to most significant using divmod, then reverse them, so the
+    string is built once rather than prepended to for every digit.
     '''
-    base58_string = ''
     num_copy = num
     # If num_copy is negative, keep adding 58 until it isn't
     # Negative numbers will always result in a single residue
@@ -32,28 +37,94 @@ def int_to_base58(num: int) -> str:
     while num_copy < 0:
         num_copy += 58
     if num_copy == 0:
-        base58_string = '1'
-    else:
-        while num_copy > 0:
-            remainder = num_copy % 58
-            base58_string = BASE58_LIST[remainder] + base58_string
-            num_copy = num_copy // 58
-    return base58_string
+        return '1'
+
+    digits = []
+    while num_copy > 0:
+        num_copy, remainder = divmod(num_copy, 58)
+        digits.append(BASE58_LIST[remainder])
+    return ''.join(reversed(digits))
 
 
 def base58_to_int(base58_string: str) -> int:
     '''
-    To convert a base58 string back to an int:
-        -For each character, find the numeric index in the list
-        -Multiply this numeric value by a corresponding power of 58
-        -Sum all values
+    To convert a base58 string back to an int we use Horner's method: for each character, multiply the running total
+    by 58 and add the numeric value of the character, found in the BASE58_INDEX dict.
+    '''
+    total = 0
+    for c in base58_string:
+        try:
+            total = total * 58 + BASE58_INDEX[c]
+        except KeyError:
+            raise ValueError(f'{c} is not a base58 character')
+    return total
+
+
+def ints_to_base58(nums: list) -> list:
+    return [int_to_base58(num) for num in nums]
+
+
+def base58_to_ints(base58_strings: list) -> list:
+    return [base58_to_int(base58_string) for base58_string in base58_strings]
+
+
+def bytes_to_base58(data: bytes) -> str:
+    '''
+    Returns the base58 encoding of the bytes. As in Bitcoin, each leading zero byte is encoded as a leading '1' so
+    that the encoding can be reversed exactly.
+    '''
+    zeros = len(data) - len(data.lstrip(b'\x00'))
+    num = int.from_bytes(data, 'big')
+    if num == 0:
+        return '1' * zeros
+    return '1' * zeros + int_to_base58(num)
+
+
+def base58_to_bytes(base58_string: str) -> bytes:
+    '''
+    Returns the bytes encoded by bytes_to_base58.
+    '''
+    zeros = len(base58_string) - len(base58_string.lstrip('1'))
+    num = base58_to_int(base58_string[zeros:])
+    return b'\x00' * zeros + num.to_bytes((num.bit_length() + 7) // 8, 'big')
+
+
+'''
+BINARY FIELDS
+'''
+
+
+def hex_to_field(hex_string: str) -> bytes:
+    '''
+    Packs a variable length hex string as 1 byte for the number of hex characters, followed by the bytes of the string.
+    Odd length strings get a leading 0 nibble, which we drop again when unpacking.
+    '''
+    assert len(hex_string) < 256
+    if len(hex_string) % 2 == 1:
+        return bytes([len(hex_string)]) + bytes.fromhex('0' + hex_string)
+    return bytes([len(hex_string)]) + bytes.fromhex(hex_string)
+
+
+def field_to_hex(buffer, offset: int):
+    '''
+    Unpacks the hex string packed by hex_to_field at the given offset of the buffer. Returns the hex string and the
+    offset of the next field.
     '''
+    length = buffer[offset]
+    end = offset + 1 + (length + 1) // 2
+    hex_string = bytes(buffer[offset + 1:end]).hex()
+    return hex_string[len(hex_string) - length:], end
+
 
-    sum = 0
-    for x in range(0, len(base58_string)):
-        numeric_val = BASE58_LIST.index(base58_string[x:x + 1])
-        sum += numeric_val * pow(58, len(base58_string) - x - 1)
-    return sum
+def hex_to_bytes(hex_string: str, byte_length: int) -> bytes:
+    '''
+    Returns the fixed length big-endian bytes of the hex value.
+    '''
+    return int(hex_string, 16).to_bytes(byte_length, 'big')
+
+
+def bytes_to_int(buffer, offset: int, byte_length: int) -> int:
+    return int.from_bytes(buffer[offset:offset + byte_length], 'big')
 
 
 '''
@@ -141,3 +212,94 @@ CHECKSUM VERIFY
 def verify_checksum(data: str, checksum: str):
     local_hash = sha256(data.encode()).hexdigest()
     return local_hash == checksum
+
+
+'''
+FROZEN OBJECTS
+'''
+
+
+class Frozen:
+    '''
+    The base class of objects which can't be changed once constructed. A subclass lists its fields in __slots__, sets
+    them in __init__ and then calls freeze.
+    '''
+    __slots__ = ('_frozen',)
+
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError(f'{type(self).__name__} is immutable')
+        object.__setattr__(self, name, value)
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def freeze(self):
+        self._frozen = True
+
+
+'''
+LRU CACHE
+'''
+
+
+class LRUCache:
+    '''
+    A bounded dictionary which discards the least recently used key once it holds maxsize keys. We count the hits and
+    misses of get so that the size can be tuned. A maxsize of 0 disables the cache.
+    '''
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(maxsize, 0)
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @property
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data), "maxsize": self.maxsize}
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def keys(self) -> list:
+        with self._lock:
+            return list(self._data.keys())
+
+    def discard(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = max(maxsize, 0)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
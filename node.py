@@ -10,7 +10,7 @@ import socket
 import threading
 from collections import Counter
 
-from block import Block, decode_raw_block
+from block import Block, BlockView
 from blockchain import Blockchain
 from helpers import utc_to_seconds, list_to_node, verify_checksum
 from miner import Miner
@@ -154,7 +154,7 @@ class Node:
 
     @property
     def status(self):
-        last_block = decode_raw_block(self.last_block)
+        last_block = BlockView(self.last_block)
         height = self.height
         hash = last_block.id
         timestamp = int(last_block.timestamp, 16)
@@ -190,7 +190,7 @@ class Node:
     def hashlist(self):
         hashlist = []
         for raw_block in self.blockchain.chain:
-            hashlist.append(decode_raw_block(raw_block).id)
+            hashlist.append(BlockView(raw_block).id)
         return hashlist
 
     @property
@@ -386,7 +386,7 @@ class Node:
             self.validated_transactions.insert(0, mining_transaction.raw_tx)
 
             # Create candidate block
-            last_block = decode_raw_block(self.last_block)
+            last_block = BlockView(self.last_block)
             new_block = Block(last_block.id, self.target, 0, self.validated_transactions)
 
             # Mine block
@@ -397,7 +397,7 @@ class Node:
             if mined_raw_block != '':
                 end_time = utc_to_seconds()
                 mining_time = end_time - start_time
-                mined_block = decode_raw_block(mined_raw_block)
+                mined_block = BlockView(mined_raw_block)
                 added = self.add_block(mined_block.raw_block)
                 if added:
                     hash_rate = int(mined_block.nonce, 16) // mining_time
@@ -505,6 +505,9 @@ class Node:
 
         With the final check complete, either the tx is added to the validated tx pool or the orphaned tx pool,
         depending on the orphan flag.
+
+        Validated signatures are saved in the signature cache of the Blockchain, so they aren't validated again when
+        the tx arrives in a Block.
         '''
 
         # Recover the transaction object
@@ -588,7 +591,28 @@ class Node:
         '''
         orphan_copies = self.orphaned_transactions.copy()
         self.orphaned_transactions = []
+
+        # Validate the signatures of every input whose parent has arrived in one batch. The valid signatures are saved
+        # in the signature cache, so add_transaction doesn't validate them again. Orphans with an invalid signature
+        # are rejected here, so their inputs aren't validated a second time.
+        signature_entries = []
+        entry_owners = []
+        for r in orphan_copies:
+            for i in decode_raw_transaction(r).inputs:
+                tx_index = int(i.tx_index, 16)
+                input_index = self.utxos.index[(self.utxos['tx_id'] == i.tx_id) & (self.utxos['tx_index'] == tx_index)]
+                if not input_index.empty:
+                    address = self.utxos.loc[input_index]['address'].values[0]
+                    signature_entries.append((i.signature, address, i.tx_id))
+                    entry_owners.append(r)
+        results = self.blockchain.validate_signatures_batch(signature_entries)
+        rejected = {r for r, valid in zip(entry_owners, results) if not valid}
+
         for r in orphan_copies:
+            if r in rejected:
+                # Logging
+                print('Signature error in orphaned transaction.')
+                continue
             self.add_transaction(r)
 
     '''
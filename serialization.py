@@ -0,0 +1,136 @@
+'''
+Binary serialization
+
+The raw hex strings of the utxos, transactions and blocks use two characters per byte. For storage and for the
+network we instead send the binary form, wrapped in a versioned frame so that nodes can agree on the format:
+
+#====================================================================#
+#|  field       |   bit size    |   hex chars   |   byte size       |#
+#====================================================================#
+#|  version     |   8           |   2           |   1               |#
+#|  kind        |   8           |   2           |   1               |#
+#|  length      |   32          |   8           |   4               |#
+#|  payload     |   var         |   var         |   var             |#
+#====================================================================#
+
+The binary forms convert losslessly to and from the hex forms. Ids are still the hash of the raw hex, so that they
+agree across both formats.
+'''
+
+'''
+IMPORTS
+'''
+from utxo import decode_raw_input_utxo, decode_raw_output_utxo, decode_binary_input_utxo, decode_binary_output_utxo
+from transaction import decode_raw_transaction, decode_binary_transaction
+from block import decode_raw_block, decode_binary_block
+
+'''
+CONSTANTS
+'''
+# Version 0 is the hex format, version 1 the first binary format
+HEX_FORMAT_VERSION = 0
+FORMAT_VERSION = 1
+SUPPORTED_VERSIONS = [HEX_FORMAT_VERSION, FORMAT_VERSION]
+
+VERSION_BYTES = 1
+KIND_BYTES = 1
+LENGTH_BYTES = 4
+FRAME_HEADER_BYTES = VERSION_BYTES + KIND_BYTES + LENGTH_BYTES
+
+INPUT_UTXO = 1
+OUTPUT_UTXO = 2
+TRANSACTION = 3
+BLOCK = 4
+
+# For each kind: the raw decoder and the binary decoder
+DECODERS = {
+    INPUT_UTXO: (decode_raw_input_utxo, decode_binary_input_utxo),
+    OUTPUT_UTXO: (decode_raw_output_utxo, decode_binary_output_utxo),
+    TRANSACTION: (decode_raw_transaction, decode_binary_transaction),
+    BLOCK: (decode_raw_block, decode_binary_block)
+}
+
+'''
+FRAMING
+'''
+
+
+def encode_frame(payload: bytes, kind: int, version=FORMAT_VERSION) -> bytes:
+    assert version in SUPPORTED_VERSIONS, f'Unsupported format version {version}'
+    assert kind in DECODERS, f'Unknown kind {kind}'
+    return (version.to_bytes(VERSION_BYTES, 'big') + kind.to_bytes(KIND_BYTES, 'big')
+            + len(payload).to_bytes(LENGTH_BYTES, 'big') + payload)
+
+
+def decode_frame(frame: bytes):
+    '''
+    Returns the version, kind and payload of the frame. The payload is a memoryview of the frame, so no copy is made.
+    '''
+    assert len(frame) >= FRAME_HEADER_BYTES, 'Frame is missing its header'
+    view = memoryview(frame)
+    version = int.from_bytes(view[:VERSION_BYTES], 'big')
+    kind = int.from_bytes(view[VERSION_BYTES:VERSION_BYTES + KIND_BYTES], 'big')
+    length = int.from_bytes(view[VERSION_BYTES + KIND_BYTES:FRAME_HEADER_BYTES], 'big')
+    assert version in SUPPORTED_VERSIONS, f'Unsupported format version {version}'
+    assert kind in DECODERS, f'Unknown kind {kind}'
+    assert len(frame) == FRAME_HEADER_BYTES + length, 'Frame length does not match payload'
+    return version, kind, view[FRAME_HEADER_BYTES:]
+
+
+def negotiate_format_version(peer_versions: list) -> int:
+    '''
+    Returns the highest format version supported by both us and the peer. Every node supports the hex format.
+    '''
+    common = set(SUPPORTED_VERSIONS).intersection(peer_versions)
+    if not common:
+        return HEX_FORMAT_VERSION
+    return max(common)
+
+
+'''
+CONVERSION
+'''
+
+
+def hex_to_binary(raw: str, kind: int, version=FORMAT_VERSION) -> bytes:
+    '''
+    Returns the frame of the raw hex utxo, transaction or block, in the given format version.
+    '''
+    raw_decoder, _ = DECODERS[kind]
+    if version == HEX_FORMAT_VERSION:
+        return encode_frame(raw.encode(), kind, version)
+
+    obj = raw_decoder(raw)
+    if kind == BLOCK:
+        payload = obj.binary_block
+    elif kind == TRANSACTION:
+        payload = obj.binary_tx
+    else:
+        payload = obj.binary_utxo
+    return encode_frame(payload, kind, version)
+
+
+def decode_binary(frame: bytes):
+    '''
+    Returns the utxo, transaction or block in the frame.
+    '''
+    version, kind, payload = decode_frame(frame)
+    raw_decoder, binary_decoder = DECODERS[kind]
+    if version == HEX_FORMAT_VERSION:
+        return raw_decoder(bytes(payload).decode())
+
+    obj, end = binary_decoder(payload)
+    assert end == len(payload), 'Trailing bytes in payload'
+    return obj
+
+
+def binary_to_hex(frame: bytes) -> str:
+    '''
+    Returns the raw hex of the utxo, transaction or block in the frame.
+    '''
+    obj = decode_binary(frame)
+    if hasattr(obj, 'raw_block'):
+        return obj.raw_block
+    elif hasattr(obj, 'raw_tx'):
+        return obj.raw_tx
+    return obj.raw_utxo
@@ -0,0 +1,166 @@
+'''
+Benchmarks for the Block class
+
+Run with: python -m tests.benchmarks.benchmark_block
+'''
+
+'''
+IMPORTS
+'''
+import secrets
+from hashlib import sha256
+
+from block import Block, BlockView, decode_raw_block, decode_raw_header
+from transaction import Transaction, decode_raw_transaction
+from utxo import UTXO_INPUT, UTXO_OUTPUT, decode_raw_input_utxo, decode_raw_output_utxo
+from wallet import Wallet
+from tests.benchmarks.benchmark_cryptography import time_call
+
+'''
+HELPERS
+'''
+
+
+def synthetic_transactions(tx_num: int, wallet_num=20) -> list:
+    '''
+    Returns tx_num raw transactions, each with one input and two outputs. Signatures are reused across the wallets so
+    that the set up stays fast; they aren't validated here.
+    '''
+    wallets = Wallet.generate_many(wallet_num)
+    signed = []
+    for w in wallets:
+        tx_id = sha256(secrets.token_bytes(32)).hexdigest()
+        signed.append((tx_id, w.sign_transaction(tx_id), w.address))
+
+    raw_txs = []
+    for x in range(tx_num):
+        tx_id, sig, address = signed[x % wallet_num]
+        inputs = [UTXO_INPUT(tx_id, x % 256, sig).raw_utxo]
+        outputs = [UTXO_OUTPUT(secrets.randbelow(1000), address).raw_utxo,
+                   UTXO_OUTPUT(secrets.randbelow(1000), signed[(x + 1) % wallet_num][2]).raw_utxo]
+        raw_txs.append(Transaction(inputs, outputs).raw_tx)
+    return raw_txs
+
+
+def slicing_decode_raw_transaction(raw_tx: str):
+    '''
+    The original decoder for coin transactions, which slices off the rest of the string for every utxo and
+    re-serializes it to find its length, then has Transaction decode the raw utxos again.
+    '''
+    input_num = int(raw_tx[2:4], 16)
+    inputs = []
+    temp_index = 4
+    for x in range(0, input_num):
+        raw_input_utxo = decode_raw_input_utxo(raw_tx[temp_index:]).raw_utxo
+        inputs.append(raw_input_utxo)
+        temp_index += len(raw_input_utxo)
+
+    output_num = int(raw_tx[temp_index: temp_index + 2], 16)
+    outputs = []
+    temp_index += 2
+    for y in range(0, output_num):
+        raw_output_utxo = decode_raw_output_utxo(raw_tx[temp_index:]).raw_utxo
+        outputs.append(raw_output_utxo)
+        temp_index += len(raw_output_utxo)
+
+    version = int(raw_tx[temp_index:temp_index + 2], 16)
+    return Transaction(inputs=inputs, outputs=outputs, version=version)
+
+
+def slicing_decode_raw_block(raw_block: str):
+    '''
+    The original block decoder, which slices off the rest of the string for every transaction and re-serializes it to
+    find its length, then has Block decode the raw transactions again.
+    '''
+    header_hexchars = (Block.VERSION_BITS + 2 * Block.HASH_BITS + Block.TIMESTAMP_BITS + Block.TARGET_BITS
+                       + Block.NONCE_BITS) // 4
+    header_dict = decode_raw_header(raw_block[:header_hexchars])
+    raw_block_tx = raw_block[header_hexchars:]
+
+    tx_num = int(raw_block_tx[:Block.TRANSACTION_NUM_BITS // 4], 16)
+    transactions = []
+    temp_index = Block.TRANSACTION_NUM_BITS // 4
+    for x in range(0, tx_num):
+        new_raw_tx = decode_raw_transaction(raw_block_tx[temp_index:]).raw_tx
+        transactions.append(new_raw_tx)
+        temp_index = temp_index + len(new_raw_tx)
+
+    new_block = Block(header_dict['prev_hash'], header_dict['target'], header_dict['nonce'],
+                      transactions=transactions, timestamp=header_dict['timestamp'], version=header_dict['version'])
+    assert new_block.merkle_root == header_dict['merkle_root']
+    return new_block
+
+
+def header_and_id(block):
+    return block.id, int(block.timestamp, 16)
+
+
+'''
+BENCHMARKS
+'''
+
+
+def benchmark_decode_block(tx_nums=(1000, 10000, 50000)):
+    '''
+    Compares the original and single pass block decoders. The original path is quadratic in the block size, so each
+    decoder is timed once.
+    '''
+    raw_txs = synthetic_transactions(max(tx_nums))
+    print('decode_raw_block (s)          original   offset')
+    for tx_num in tx_nums:
+        raw_block = Block(sha256(b'prev').hexdigest(), 1, 0, raw_txs[:tx_num]).raw_block
+        original = time_call(lambda: slicing_decode_raw_block(raw_block), 1) / 1000
+        offset = time_call(lambda: decode_raw_block(raw_block), 1) / 1000
+        print(f'    {tx_num:>5} transactions        {original:>8.3f} {offset:>8.3f}')
+
+
+def benchmark_decode_transaction(number=20):
+    '''
+    Compares the original and offset based decoders on transactions with 1 to 255 inputs and outputs.
+    '''
+    w = Wallet()
+    tx_id = sha256(b'tx_id').hexdigest()
+    raw_input = UTXO_INPUT(tx_id, 0, w.sign_transaction(tx_id)).raw_utxo
+    raw_output = UTXO_OUTPUT(1000, w.address).raw_utxo
+    print('decode_raw_transaction (ms)   original   offset')
+    for utxo_num in [1, 16, 64, 255]:
+        raw_tx = Transaction([raw_input] * utxo_num, [raw_output] * utxo_num).raw_tx
+        assert slicing_decode_raw_transaction(raw_tx).raw_tx == decode_raw_transaction(raw_tx).raw_tx
+        original = time_call(lambda: slicing_decode_raw_transaction(raw_tx), number)
+        offset = time_call(lambda: decode_raw_transaction(raw_tx), number)
+        print(f'    {utxo_num:>3} inputs and outputs   {original:>8.3f} {offset:>8.3f}')
+
+
+def benchmark_tx_ids(tx_num=5000, number=20):
+    '''
+    Times Block.tx_ids and the methods built on it. The first call computes every id, later calls reuse them.
+    '''
+    block = Block(sha256(b'prev').hexdigest(), 1, 0, synthetic_transactions(tx_num))
+    last_id = block.transactions[-1].id
+    print(f'Block with {tx_num} transactions (ms)')
+    print(f'    tx_ids                    {time_call(lambda: block.tx_ids, number):>10.3f}')
+    print(f'    calc_merkle_root          {time_call(block.calc_merkle_root, number):>10.3f}')
+    print(f'    merkle_proof              {time_call(lambda: block.merkle_proof(last_id), number):>10.3f}')
+    print(f'    get_raw_tx                {time_call(lambda: block.get_raw_tx(last_id), number):>10.3f}')
+    print(f'    raw_block                 {time_call(lambda: block.raw_block, number):>10.3f}')
+
+
+def benchmark_block_view(tx_nums=(1, 1000, 10000), number=5):
+    '''
+    Compares reading the header and id of a raw block through a decoded Block and through a BlockView, as in
+    Node.status and Node.hashlist.
+    '''
+    raw_txs = synthetic_transactions(max(tx_nums))
+    print('block id and timestamp (ms)   Block      BlockView')
+    for tx_num in tx_nums:
+        raw_block = Block(sha256(b'prev').hexdigest(), 1, 0, raw_txs[:tx_num]).raw_block
+        block = time_call(lambda: header_and_id(decode_raw_block(raw_block)), number)
+        view = time_call(lambda: header_and_id(BlockView(raw_block)), number)
+        print(f'    {tx_num:>5} transactions        {block:>8.3f} {view:>8.3f}')
+
+
+if __name__ == '__main__':
+    benchmark_tx_ids()
+    benchmark_decode_transaction()
+    benchmark_decode_block()
+    benchmark_block_view()
@@ -0,0 +1,77 @@
+'''
+Benchmarks for Blockchain validation
+
+Run with: python -m tests.benchmarks.benchmark_blockchain
+'''
+
+'''
+IMPORTS
+'''
+import os
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from hashlib import sha256
+
+from blockchain import verify_signature_entries, verify_signature_entries_parallel
+from cryptography import EllipticCurve
+from helpers import get_signature_parts
+from wallet import Wallet
+
+'''
+HELPERS
+'''
+
+
+def synthetic_block_inputs(input_num: int, wallet_num=20) -> list:
+    '''
+    Returns the (compressed_public_key, (r,s), tx_id) entries for a block with input_num inputs, spent by wallet_num
+    different wallets.
+    '''
+    wallets = [Wallet() for _ in range(wallet_num)]
+    entries = []
+    for x in range(input_num):
+        w = wallets[x % wallet_num]
+        tx_id = sha256(secrets.token_bytes(32)).hexdigest()
+        cpk, (r_h, s_h) = get_signature_parts(w.sign_transaction(tx_id))
+        entries.append((cpk, (int(r_h, 16), int(s_h, 16)), tx_id))
+    return entries
+
+
+'''
+BENCHMARKS
+'''
+
+
+def benchmark_parallel_validation(input_nums=(100, 300, 600)):
+    '''
+    Compares validating the input signatures of a block in this process against spreading them over worker pools.
+    '''
+    curve = EllipticCurve(validation=EllipticCurve.VALIDATION_FAST)
+    worker_nums = [w for w in [2, 4, 8, 16] if w <= max(os.cpu_count(), 2)]
+    pools = {}
+    for workers in worker_nums:
+        pools.update({workers: ProcessPoolExecutor(max_workers=workers)})
+        # Warm up the workers so the generator tables are built
+        verify_signature_entries_parallel(pools[workers], curve, synthetic_block_inputs(workers, workers), workers)
+
+    print('block signature validation (ms)')
+    print('    inputs    serial' + ''.join(f'{f"{w} workers":>12}' for w in worker_nums))
+    for input_num in input_nums:
+        entries = synthetic_block_inputs(input_num)
+        start = time.perf_counter()
+        serial_results = verify_signature_entries(curve, entries)
+        row = f'    {input_num:<6}{1000 * (time.perf_counter() - start):>10.1f}'
+        for workers in worker_nums:
+            start = time.perf_counter()
+            results = verify_signature_entries_parallel(pools[workers], curve, entries, workers)
+            row += f'{1000 * (time.perf_counter() - start):>12.1f}'
+            assert results == serial_results
+        print(row)
+
+    for pool in pools.values():
+        pool.shutdown()
+
+
+if __name__ == '__main__':
+    benchmark_parallel_validation()
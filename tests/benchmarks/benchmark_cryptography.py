@@ -0,0 +1,153 @@
+'''
+Benchmarks for the EllipticCurve class
+
+Run with: python -m tests.benchmarks.benchmark_cryptography
+'''
+
+'''
+IMPORTS
+'''
+import primefac
+import secrets
+import timeit
+from hashlib import sha256
+
+from cryptography import EllipticCurve, ARITHMETIC_BACKENDS, count_points_chunk, count_points_vectorized, \
+    count_points_parallel
+from helpers import get_signature_parts
+from wallet import Wallet
+
+'''
+HELPERS
+'''
+
+
+def time_call(function, number: int) -> float:
+    '''
+    Returns the average time in milliseconds of number calls to function.
+    '''
+    return 1000 * timeit.timeit(function, number=number) / number
+
+
+def signed_hashes(count: int):
+    '''
+    Returns a wallet and a list of (signature, tx_hash) pairs signed by the wallet.
+    '''
+    w = Wallet()
+    signatures = []
+    for _ in range(count):
+        tx_hash = sha256(secrets.token_bytes(32)).hexdigest()
+        _, (r_h, s_h) = get_signature_parts(w.sign_transaction(tx_hash))
+        signatures.append(((int(r_h, 16), int(s_h, 16)), tx_hash))
+    return w, signatures
+
+
+class GenericCurve(EllipticCurve):
+    '''
+    The Bitcoin curve without the GLV endomorphism.
+    '''
+    has_endomorphism = False
+
+
+'''
+BENCHMARKS
+'''
+
+
+def benchmark_validation_levels(number=50):
+    '''
+    Compares verify_signature, with and without recovering the public key point, under full and fast validation.
+    '''
+    w, signatures = signed_hashes(number)
+    cpk = w.compressed_public_key
+    print('verify_signature (ms)           full      fast')
+    results = {}
+    for validation in [EllipticCurve.VALIDATION_FULL, EllipticCurve.VALIDATION_FAST]:
+        curve = EllipticCurve(validation=validation)
+        curve.generator_table
+        verify = time_call(lambda: [curve.verify_signature(sig, tx_hash, w.public_key_point)
+                                    for sig, tx_hash in signatures], 1) / number
+        recover = time_call(lambda: [curve.verify_signature(sig, tx_hash, curve.get_public_key_point(cpk))
+                                     for sig, tx_hash in signatures], 1) / number
+        results.update({validation: (verify, recover)})
+    full, fast = results[EllipticCurve.VALIDATION_FULL], results[EllipticCurve.VALIDATION_FAST]
+    print(f'    known point               {full[0]:>8.3f}  {fast[0]:>8.3f}')
+    print(f'    compressed key            {full[1]:>8.3f}  {fast[1]:>8.3f}')
+
+
+def benchmark_endomorphism(number=50):
+    '''
+    Compares scalar multiplication of a non-generator point, and verify_signature, with and without the GLV
+    endomorphism.
+    '''
+    w, signatures = signed_hashes(number)
+    scalars = [secrets.randbelow(EllipticCurve.BITCOIN_GROUPORDER) for _ in range(number)]
+    print('GLV endomorphism (ms)           generic   GLV')
+    results = []
+    for curve in [GenericCurve(validation=EllipticCurve.VALIDATION_FAST),
+                  EllipticCurve(validation=EllipticCurve.VALIDATION_FAST)]:
+        curve.generator_table
+        multiply = time_call(lambda: [curve.scalar_multiplication(n, w.public_key_point) for n in scalars], 1) / number
+        verify = time_call(lambda: [curve.verify_signature(sig, tx_hash, w.public_key_point)
+                                    for sig, tx_hash in signatures], 1) / number
+        results.append((multiply, verify))
+    generic, glv = results
+    print(f'    scalar_multiplication     {generic[0]:>8.3f}  {glv[0]:>8.3f}')
+    print(f'    verify_signature          {generic[1]:>8.3f}  {glv[1]:>8.3f}')
+
+
+def benchmark_backends(number=50):
+    '''
+    Compares keygen, sign and verify across the available arithmetic backends.
+    '''
+    tx_hashes = [sha256(secrets.token_bytes(32)).hexdigest() for _ in range(number)]
+    scalars = [secrets.randbelow(EllipticCurve.BITCOIN_GROUPORDER) for _ in range(number)]
+    print('arithmetic backend (ms)         keygen    sign      verify')
+    for backend in ARITHMETIC_BACKENDS:
+        w = Wallet()
+        w.curve = EllipticCurve(validation=EllipticCurve.VALIDATION_FAST, backend=backend)
+        w.curve.generator_table
+        keygen = time_call(lambda: [w.curve.scalar_multiplication(k, w.curve.generator) for k in scalars], 1) / number
+        signatures = []
+        sign = time_call(lambda: signatures.extend(w.sign_transaction(h) for h in tx_hashes), 1) / number
+        parts = [get_signature_parts(sig)[1] for sig in signatures]
+        verify = time_call(lambda: [w.curve.verify_signature((int(r_h, 16), int(s_h, 16)), h, w.public_key_point)
+                                    for (r_h, s_h), h in zip(parts, tx_hashes)], 1) / number
+        print(f'    {backend:<26}{keygen:>8.3f}  {sign:>8.3f}  {verify:>8.3f}')
+
+
+def benchmark_signing(number=100):
+    '''
+    Compares sign_transaction and sign_transactions with and without self-verification.
+    '''
+    w = Wallet()
+    tx_hashes = [sha256(secrets.token_bytes(32)).hexdigest() for _ in range(number)]
+    print('signing (ms)                    verify    no verify')
+    single = [time_call(lambda: [w.sign_transaction(h, verify=verify) for h in tx_hashes], 1) / number
+              for verify in [True, False]]
+    batch = [time_call(lambda: w.sign_transactions(tx_hashes, verify=verify), 1) / number for verify in [True, False]]
+    print(f'    sign_transaction          {single[0]:>8.3f}  {single[1]:>8.3f}')
+    print(f'    sign_transactions         {batch[0]:>8.3f}  {batch[1]:>8.3f}')
+
+
+def benchmark_group_order(bit_sizes=(12, 16, 20), workers=4):
+    '''
+    Compares the serial, vectorized and parallel point counts across sizes of p.
+    '''
+    print('find_group_order (ms)           serial    numpy     parallel')
+    for bits in bit_sizes:
+        p = pow(2, bits) + 1
+        while not primefac.isprime(p):
+            p += 2
+        serial = time_call(lambda: count_points_chunk(2, 3, p, 0, p), 1)
+        vectorized = time_call(lambda: count_points_vectorized(2, 3, p), 1)
+        parallel = time_call(lambda: count_points_parallel(2, 3, p, workers), 1)
+        print(f'    p ~ 2^{bits:<21}{serial:>8.1f}  {vectorized:>8.1f}  {parallel:>8.1f}')
+
+
+if __name__ == '__main__':
+    benchmark_validation_levels()
+    benchmark_endomorphism()
+    benchmark_backends()
+    benchmark_signing()
+    benchmark_group_order()
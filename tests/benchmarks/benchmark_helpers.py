@@ -0,0 +1,64 @@
+'''
+Benchmarks for the helper functions
+
+Run with: python -m tests.benchmarks.benchmark_helpers
+'''
+
+'''
+IMPORTS
+'''
+import secrets
+
+from helpers import BASE58_LIST, int_to_base58, base58_to_int, ints_to_base58, base58_to_ints
+from tests.benchmarks.benchmark_cryptography import time_call
+
+'''
+HELPERS
+'''
+
+
+def prepend_int_to_base58(num: int) -> str:
+    '''
+    The original encoder, which prepends a character for every digit.
+    '''
+    base58_string = ''
+    while num > 0:
+        base58_string = BASE58_LIST[num % 58] + base58_string
+        num //= 58
+    return base58_string
+
+
+def index_base58_to_int(base58_string: str) -> int:
+    '''
+    The original decoder, which looks up every character in the list and computes a power of 58 for every digit.
+    '''
+    total = 0
+    for x in range(0, len(base58_string)):
+        total += BASE58_LIST.index(base58_string[x]) * pow(58, len(base58_string) - x - 1)
+    return total
+
+
+'''
+BENCHMARKS
+'''
+
+
+def benchmark_base58(number=10000):
+    '''
+    Compares the original and current base58 codecs on 192-bit address values.
+    '''
+    nums = [secrets.randbits(192) for _ in range(number)]
+    addresses = ints_to_base58(nums)
+    print('base58 (us)                     original  current   bulk')
+    encode = [time_call(lambda: [f(num) for num in nums], 1) * 1000 / number
+              for f in [prepend_int_to_base58, int_to_base58]]
+    encode.append(time_call(lambda: ints_to_base58(nums), 1) * 1000 / number)
+    decode = [time_call(lambda: [f(address) for address in addresses], 1) * 1000 / number
+              for f in [index_base58_to_int, base58_to_int]]
+    decode.append(time_call(lambda: base58_to_ints(addresses), 1) * 1000 / number)
+    print(f'    encode                    {encode[0]:>8.3f}  {encode[1]:>8.3f}  {encode[2]:>8.3f}')
+    print(f'    decode                    {decode[0]:>8.3f}  {decode[1]:>8.3f}  {decode[2]:>8.3f}')
+
+
+if __name__ == '__main__':
+    benchmark_base58()
@@ -0,0 +1,71 @@
+'''
+Benchmarks for the Wallet class
+
+Run with: python -m tests.benchmarks.benchmark_wallet
+'''
+
+'''
+IMPORTS
+'''
+import secrets
+from hashlib import sha256
+
+from tests.benchmarks.benchmark_cryptography import time_call
+from wallet import Wallet
+
+'''
+BENCHMARKS
+'''
+
+
+def benchmark_generate_many(number=200, workers=2):
+    '''
+    Compares creating wallets one at a time with generate_many, for wallets and bare records.
+    '''
+    print('wallet generation (ms)          per wallet')
+    single = time_call(lambda: [Wallet() for _ in range(number)], 1) / number
+    many = time_call(lambda: Wallet.generate_many(number), 1) / number
+    records = time_call(lambda: Wallet.generate_many(number, records=True), 1) / number
+    parallel = time_call(lambda: Wallet.generate_many(number, records=True, workers=workers), 1) / number
+    print(f'    Wallet()                  {single:>8.3f}')
+    print(f'    generate_many             {many:>8.3f}')
+    print(f'    generate_many records     {records:>8.3f}')
+    print(f'    records, {workers} workers       {parallel:>8.3f}')
+
+
+def benchmark_child_addresses(number=1000):
+    '''
+    Compares a new wallet per deposit address with child addresses derived from one wallet.
+    '''
+    w = Wallet()
+    print('deposit addresses (ms)          per address')
+    wallets = time_call(lambda: [Wallet().address for _ in range(number)], 1) / number
+    derived = time_call(lambda: w.child_addresses(0, number), 1) / number
+    cached = time_call(lambda: w.child_addresses(0, number), 1) / number
+    print(f'    Wallet()                  {wallets:>8.3f}')
+    print(f'    child_addresses           {derived:>8.3f}')
+    print(f'    child_addresses cached    {cached:>8.3f}')
+
+
+def benchmark_create_transaction(utxo_count=2000, number=200):
+    '''
+    Times create_transaction for random payouts from a wallet holding utxo_count utxos, with and without
+    self-verification of the signatures.
+    '''
+    receiver = Wallet().address
+    print('create_transaction (ms)         verify    no verify')
+    results = []
+    for verify in [True, False]:
+        w = Wallet()
+        w.utxo_index.load([(sha256(secrets.token_bytes(32)).hexdigest(), 1, secrets.randbelow(1000) + 1, w.address)
+                           for _ in range(utxo_count)])
+        amounts = [secrets.randbelow(2000) + 1 for _ in range(number)]
+        results.append(time_call(lambda: [w.create_transaction(receiver, amount, verify=verify) for amount in amounts],
+                                 1) / number)
+    print(f'    per payout                {results[0]:>8.3f}  {results[1]:>8.3f}')
+
+
+if __name__ == '__main__':
+    benchmark_generate_many()
+    benchmark_child_addresses()
+    benchmark_create_transaction()
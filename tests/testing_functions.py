@@ -22,13 +22,13 @@ def generate_transaction():
     input_num = 0
     while input_num == 0:
         input_num = np.random.randint(10)
-    for x in range(0, input_num):
+    for w in Wallet.generate_many(input_num):
         random_string = ''
         for r in range(0, np.random.randint(100)):
             random_string += random.choice(string.ascii_letters)
         tx_id = sha256(random_string.encode()).hexdigest()
         tx_index = np.random.randint(100)
-        sig = Wallet().sign_transaction(tx_id)
+        sig = w.sign_transaction(tx_id)
         inputs.append(UTXO_INPUT(tx_id, tx_index, sig).raw_utxo)
 
     # Create outputs
@@ -36,10 +36,8 @@ def generate_transaction():
     output_num = 0
     while output_num == 0:
         output_num = np.random.randint(10)
-    for y in range(0, output_num):
+    for address, _ in Wallet.generate_many(output_num, records=True):
         amount = np.random.randint(1000)
-        temp_wallet = Wallet()
-        address = temp_wallet.address
         utxo_output = UTXO_OUTPUT(amount, address)
         outputs.append(utxo_output.raw_utxo)
 
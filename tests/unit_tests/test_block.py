@@ -6,7 +6,8 @@ import secrets
 import string
 import numpy as np
 
-from block import Block, decode_raw_block, decode_raw_block_transactions, decode_raw_header, decode_raw_transaction
+from block import Block, BlockView, decode_raw_block, decode_raw_block_transactions, decode_raw_header, \
+    decode_raw_transaction, parse_raw_block_transactions
 from helpers import utc_to_seconds, seconds_to_utc
 from hashlib import sha256
 import datetime
@@ -111,3 +112,42 @@ def test_encoding():
     assert decoded_header['target'] == random_num2
     assert decoded_header['nonce'] == random_num3
     assert decoded_tx_ids == new_block.tx_ids == decoded_block.tx_ids
+
+
+def test_large_block_encoding():
+    '''
+    We decode a block with more than 9 transactions, so that the transaction count only parses as hex, and check the
+    transactions decode at an offset
+    '''
+    transaction = generate_transaction()
+    transactions = [transaction] * 17
+    new_block = Block(sha256('prev'.encode()).hexdigest(), 30, 0, transactions)
+    assert new_block.tx_count == '00000011'
+
+    decoded_block = decode_raw_block(new_block.raw_block)
+    assert decoded_block.raw_block == new_block.raw_block
+    assert decode_raw_block_transactions(new_block.raw_transactions) == [transaction.raw_tx] * 17
+
+    raw = '00' + new_block.raw_transactions
+    decoded_txs, index = parse_raw_block_transactions(raw, 2)
+    assert [t.id for t in decoded_txs] == new_block.tx_ids and index == len(raw)
+
+
+def test_block_view():
+    '''
+    We check the view gives the Block header fields and id without decoding the transactions, then decodes them once
+    '''
+    transactions = [generate_transaction().raw_tx for x in range(0, 3)]
+    new_block = Block(sha256('prev'.encode()).hexdigest(), 30, secrets.randbelow(pow(2, 32)), transactions)
+    view = BlockView(new_block.raw_block)
+
+    for field in ['version', 'prev_hash', 'merkle_root', 'target', 'nonce', 'timestamp', 'tx_count', 'raw_header',
+                  'raw_transactions', 'id']:
+        assert getattr(view, field) == getattr(new_block, field)
+    assert view.header == decode_raw_header(new_block.raw_header)
+    assert len(view) == 3 and view._transactions is None
+
+    assert [t.raw_tx for t in view] == transactions
+    assert view.transactions is view.transactions
+    assert view.tx_ids == new_block.tx_ids
+    assert view.to_block().raw_block == new_block.raw_block
@@ -5,13 +5,19 @@ Testing elements of the blockchain
 '''
 IMPORTS
 '''
-from blockchain import Blockchain
+from blockchain import Blockchain, verify_signature_entries, verify_signature_entries_parallel
+from concurrent.futures import ProcessPoolExecutor
+from cryptography import EllipticCurve
+from hashlib import sha256
+from helpers import get_signature_parts
 from miner import Miner
 from transaction import Transaction
 from utxo import UTXO_OUTPUT, UTXO_INPUT
 import numpy as np
 from wallet import Wallet
-from block import Block, decode_raw_block
+from block import Block, BlockView, decode_raw_block
+import pandas as pd
+import pytest
 
 '''
 GENESIS CONSTANTS
@@ -65,3 +71,120 @@ def test_genesis_block():
 #     assert not b.pop_block()
 #     b2 = Blockchain()
 #     assert b.utxos.equals(b2.utxos)
+
+
+def test_parallel_signature_validation():
+    '''
+    We verify the worker pool gives the same results, in the same order, as validating in this process
+    '''
+    curve = EllipticCurve(validation=EllipticCurve.VALIDATION_FAST)
+    entries = []
+    for x in range(0, 6):
+        w = Wallet()
+        tx_id = sha256(f'input {x}'.encode()).hexdigest()
+        cpk, (r_h, s_h) = get_signature_parts(w.sign_transaction(tx_id))
+        entries.append((cpk, (int(r_h, 16), int(s_h, 16)), tx_id))
+
+    # Swap the tx ids of two inputs so both fail
+    cpk2, sig2, tx_id2 = entries[2]
+    cpk4, sig4, tx_id4 = entries[4]
+    entries[2] = (cpk2, sig2, tx_id4)
+    entries[4] = (cpk4, sig4, tx_id2)
+
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        results = verify_signature_entries_parallel(pool, curve, entries, 4)
+    assert results == verify_signature_entries(curve, entries)
+    assert results == [True, True, False, True, False, True]
+    assert results.index(False) == 2
+
+
+def test_signature_cache():
+    '''
+    We verify validated signatures are cached and that the cache is used by the batch validation
+    '''
+    b = Blockchain()
+    w = Wallet()
+    tx_id1 = sha256('tx_id1'.encode()).hexdigest()
+    tx_id2 = sha256('tx_id2'.encode()).hexdigest()
+    sig1 = w.sign_transaction(tx_id1)
+    sig2 = w.sign_transaction(tx_id2)
+
+    # Only valid signatures are cached
+    assert b.validate_signature(sig1, w.address, tx_id1)
+    assert not b.validate_signature(sig2, w.address, tx_id1)
+    assert (sig1, tx_id1, w.address) in b.signature_cache
+    assert len(b.signature_cache) == 1
+
+    # Batch validation consults the cache
+    misses = b.signature_cache.misses
+    assert b.validate_signatures_batch([(sig1, w.address, tx_id1), (sig2, w.address, tx_id2)]) == [True, True]
+    assert b.signature_cache.hits == 1
+    assert b.signature_cache.misses == misses + 1
+    assert len(b.signature_cache) == 2
+
+    # The address of the compressed public key is only computed once
+    assert b.address_cache.stats["size"] == 1
+    assert not b.check_address(w.compressed_public_key, Wallet().address)
+    assert b.check_address(w.compressed_public_key, w.address)
+    assert b.cache_stats["addresses"]["hits"] >= 3
+
+
+def test_multiple_input_block():
+    '''
+    We add a Block whose transaction spends several utxos and check the pool and the rows sent to the listeners agree.
+    Then we add Blocks with enough inputs to be validated by the worker pool - first with one bad signature, which must
+    be rejected - and check the pool is shut down on leaving the with block.
+    '''
+    with Blockchain(validation_workers=2) as b:
+        w = Wallet()
+        other_address = Wallet().address
+        tx_ids = [sha256(f'tx_id {x}'.encode()).hexdigest() for x in range(6)]
+        rows = [(tx_id, 1, format(amount, '016x'), address)
+                for tx_id, amount, address in zip(tx_ids, [7, 10, 10, 10, 10, 5], [other_address] + [w.address] * 5)]
+        b.utxos = pd.concat([b.utxos, pd.DataFrame(rows, columns=b.COLUMNS)], ignore_index=True)
+
+        notifications = []
+        b.add_utxo_listener(lambda added, removed: notifications.append((added, removed)))
+        w.watch(b)
+        assert w.balance == 45
+
+        tx = w.create_transaction(other_address, 30)
+        assert len(tx.inputs) == 3
+        new_block = Block(BlockView(b.last_block).id, 0, 0, [tx.raw_tx])
+        assert b.add_block(new_block.raw_block)
+
+        # The consumed rows are the ones spent by the transaction, and they're gone from the pool
+        added, removed = notifications[0]
+        spent = {(i.tx_id, int(i.tx_index, 16)) for i in tx.inputs}
+        assert {(row[0], row[1]) for row in removed} == spent
+        pool = {(row[0], row[1]) for row in b.utxos.values}
+        assert not pool & spent and len(pool) == len(rows) - 3 + len(added)
+        assert sorted(w.utxo_index.spendable) == sorted(
+            [(row[0], row[1], int(row[2], 16), row[3]) for row in b.utxos.values if row[3] == w.address])
+
+        # Parallel validation rejects a Block with one bad signature and leaves the utxo pool unchanged
+        w2 = Wallet()
+        input_num = Blockchain.PARALLEL_VALIDATION_MINIMUM + 2
+        big_tx_ids = [sha256(f'big tx_id {x}'.encode()).hexdigest() for x in range(input_num)]
+        big_rows = [(tx_id, 1, format(1, '016x'), w2.address) for tx_id in big_tx_ids]
+        b.utxos = pd.concat([b.utxos, pd.DataFrame(big_rows, columns=b.COLUMNS)], ignore_index=True)
+        signatures = w2.sign_transactions(big_tx_ids)
+        outputs = [UTXO_OUTPUT(input_num, other_address).raw_utxo]
+
+        bad_signatures = signatures[:5] + [w2.sign_transaction(big_tx_ids[6])] + signatures[6:]
+        bad_tx = Transaction([UTXO_INPUT(tx_id, 1, sig).raw_utxo for tx_id, sig in zip(big_tx_ids, bad_signatures)],
+                             outputs)
+        utxo_count = len(b.utxos)
+        assert not b.add_block(Block(BlockView(b.last_block).id, 0, 0, [bad_tx.raw_tx]).raw_block)
+        assert len(b.utxos) == utxo_count and len(notifications) == 1
+        assert b._validation_pool is not None
+
+        good_tx = Transaction([UTXO_INPUT(tx_id, 1, sig).raw_utxo for tx_id, sig in zip(big_tx_ids, signatures)],
+                              outputs)
+        assert b.add_block(Block(BlockView(b.last_block).id, 0, 0, [good_tx.raw_tx]).raw_block)
+        assert len(b.utxos) == utxo_count - input_num + 1
+
+        validation_pool = b.validation_pool
+    assert b._validation_pool is None
+    with pytest.raises(RuntimeError):
+        validation_pool.submit(abs, -1)
@@ -0,0 +1,57 @@
+'''
+Testing the coin selection strategies
+'''
+
+'''
+IMPORTS
+'''
+import secrets
+from itertools import combinations
+from coin_selection import largest_first, branch_and_bound, select_coins, LARGEST_FIRST, BRANCH_AND_BOUND
+
+'''
+TESTS
+'''
+
+
+def rows(amounts: list) -> list:
+    return [(format(x, '064x'), x, amount, 'address') for x, amount in enumerate(amounts)]
+
+
+def test_largest_first():
+    utxos = rows([5, 40, 10, 25])
+    assert [row[2] for row in largest_first(utxos, 50)] == [40, 25]
+    assert [row[2] for row in largest_first(utxos, 40)] == [40]
+    assert largest_first(utxos, 81) is None
+    assert largest_first(utxos, 0) == []
+
+
+def test_branch_and_bound():
+    utxos = rows([5, 40, 10, 25, 15, 30])
+    selection = branch_and_bound(utxos, 55)
+    assert len(selection) == 2 and sum(row[2] for row in selection) == 55
+    assert sorted(row[2] for row in branch_and_bound(utxos, 20)) == [5, 15]
+    assert branch_and_bound(utxos, 126) is None
+    assert branch_and_bound(rows([10, 20]), 15) is None
+    assert branch_and_bound(utxos, 20, max_inputs=1) is None
+    assert len(branch_and_bound(utxos, 55, max_inputs=2)) == 2
+
+    # Fewest inputs among the exact matches, compared with a brute force search
+    amounts = [secrets.randbelow(50) + 1 for _ in range(12)]
+    utxos = rows(amounts)
+    target = sum(amounts[:4])
+    fewest = min(k for k in range(1, 13) for c in combinations(amounts, k) if sum(c) == target)
+    selection = branch_and_bound(utxos, target)
+    assert sum(row[2] for row in selection) == target
+    assert len(selection) == fewest
+
+
+def test_select_coins():
+    utxos = rows([5, 40, 10, 25])
+    assert [row[2] for row in select_coins(utxos, 15)] == [40]
+    assert [row[2] for row in select_coins(utxos, 42)] == [40, 25]
+    assert sorted(row[2] for row in select_coins(utxos, 45)) == [5, 40]
+    assert sorted(row[2] for row in select_coins(rows([40, 25, 10, 30]), 55)) == [25, 30]
+    assert [row[2] for row in select_coins(utxos, 15, LARGEST_FIRST)] == [40]
+    assert select_coins(utxos, 42, BRANCH_AND_BOUND) is None
+    assert select_coins(utxos, 100) is None
@@ -0,0 +1,304 @@
+'''
+Testing the EllipticCurve class
+'''
+
+'''
+IMPORTS
+'''
+import pytest
+import secrets
+from cryptography import EllipticCurve, batch_inverse, ARITHMETIC_BACKENDS, PYTHON_BACKEND, GMPY2_BACKEND, \
+    legendre_symbol, tonelli_shanks, count_points_chunk, count_points_vectorized, count_points_parallel, \
+    rfc6979_nonces, get_default_backend, set_default_backend
+from hashlib import sha256
+from helpers import get_signature_parts
+from wallet import Wallet
+
+'''
+TEST CURVE
+'''
+# y^2 = x^3 + 2x + 2 (mod 1031) has prime group order 971
+SMALL_A = 2
+SMALL_B = 2
+SMALL_P = 1031
+SMALL_ORDER = 971
+
+
+def small_curve():
+    curve = EllipticCurve(a=SMALL_A, b=SMALL_B, p=SMALL_P, order=SMALL_ORDER)
+    curve.generator = curve.find_integer_point()
+    return curve
+
+
+'''
+TESTS
+'''
+
+
+def test_jacobian_scalar_multiplication():
+    '''
+    We verify the Jacobian double-and-add agrees with the affine reference implementation
+    '''
+    # Bitcoin curve
+    curve = EllipticCurve()
+    for _ in range(5):
+        n = secrets.randbelow(curve.order)
+        assert curve.scalar_multiplication(n, curve.generator) == curve.affine_scalar_multiplication(n,
+                                                                                                     curve.generator)
+
+    # Small curve with non-zero linear coefficient - every multiple of the generator
+    curve = small_curve()
+    for n in range(0, 2 * SMALL_ORDER + 2):
+        assert curve.scalar_multiplication(n, curve.generator) == curve.affine_scalar_multiplication(n,
+                                                                                                     curve.generator)
+
+
+def test_jacobian_group_operations():
+    curve = small_curve()
+    point1 = curve.scalar_multiplication(secrets.randbelow(SMALL_ORDER), curve.generator)
+    point2 = curve.scalar_multiplication(secrets.randbelow(SMALL_ORDER), curve.generator)
+
+    j1 = curve.to_jacobian(point1)
+    j2 = curve.double_jacobian(curve.to_jacobian(point2))
+    assert curve.is_on_curve_jacobian(j2)
+
+    # Addition, mixed addition and doubling agree with the affine rules
+    assert curve.to_affine(curve.add_jacobian(j1, j2)) == curve.add_points(point1, curve.add_points(point2, point2))
+    assert curve.to_affine(curve.add_jacobian_affine(j2, point1)) == curve.to_affine(curve.add_jacobian(j2, j1))
+    assert curve.to_affine(curve.add_jacobian(j2, j2)) == curve.to_affine(curve.double_jacobian(j2))
+
+    # Inverse points and the point at infinity
+    if point1 is not None:
+        x, y = point1
+        assert curve.add_jacobian_affine(j1, (x, -y % SMALL_P)) is None
+    assert curve.add_jacobian(None, j2) == j2
+    assert curve.to_affine(None) is None
+
+
+def test_generator_table():
+    '''
+    We verify the fixed-base multiplication agrees with the double-and-add and that the tables are shared by curves
+    with the same parameters
+    '''
+    curve = EllipticCurve()
+    for _ in range(5):
+        n = secrets.randbelow(curve.order)
+        assert curve.fixed_base_multiplication(n) == curve.affine_scalar_multiplication(n, curve.generator)
+    assert curve.generator_table is EllipticCurve().generator_table
+
+    curve = small_curve()
+    for n in range(0, SMALL_ORDER + 2):
+        assert curve.scalar_multiplication(n, curve.generator) == curve.affine_scalar_multiplication(n,
+                                                                                                     curve.generator)
+
+
+def test_multi_scalar_multiplication():
+    '''
+    We verify the interleaved multi-scalar multiplication agrees with the sum of the separate products
+    '''
+    for curve in [EllipticCurve(), small_curve()]:
+        point1 = curve.scalar_multiplication(secrets.randbelow(curve.order), curve.generator)
+        point2 = curve.scalar_multiplication(secrets.randbelow(curve.order), curve.generator)
+        points = [curve.generator, point1, point2, point1, None]
+        scalars = [secrets.randbelow(curve.order) for _ in points]
+
+        expected = None
+        for n, point in zip(scalars, points):
+            expected = curve.add_points(expected, curve.affine_scalar_multiplication(n, point))
+        assert curve.multi_scalar_multiplication(scalars, points) == expected
+
+        # Terms which cancel yield the point at infinity
+        n = secrets.randbelow(curve.order)
+        assert curve.multi_scalar_multiplication([n, curve.order - n], [point1, point1]) is None
+
+
+def test_validation_levels():
+    '''
+    We verify fast validation gives the same results and still rejects bad inputs at the API boundaries
+    '''
+    full_curve = EllipticCurve()
+    fast_curve = EllipticCurve(validation=EllipticCurve.VALIDATION_FAST)
+    n = secrets.randbelow(full_curve.order)
+    point = full_curve.scalar_multiplication(n, full_curve.generator)
+    x, y = point
+
+    assert fast_curve.scalar_multiplication(n, fast_curve.generator) == point
+    assert fast_curve.find_y_from_x(x) in [y, fast_curve.p - y]
+
+    # x values which aren't on the curve
+    bad_x = 1
+    while full_curve.is_x_on_curve(bad_x):
+        bad_x += 1
+    for curve in [full_curve, fast_curve]:
+        with pytest.raises(AssertionError):
+            curve.find_y_from_x(bad_x)
+        with pytest.raises(AssertionError):
+            curve.scalar_multiplication(n, (x, y + 1))
+
+
+def test_batch_inverse():
+    values = [secrets.randbelow(SMALL_P - 1) + 1 for _ in range(20)]
+    inverses = batch_inverse(values, SMALL_P)
+    assert inverses == [pow(v, -1, SMALL_P) for v in values]
+    assert batch_inverse([], SMALL_P) == []
+
+
+def test_verify_signatures_batch():
+    '''
+    We verify a batch of signatures, some of them invalid, and check the failures are reported at the right index
+    '''
+    curve = EllipticCurve()
+    entries = []
+    for x in range(6):
+        w = Wallet()
+        tx_hash = sha256(f'tx_hash {x}'.encode()).hexdigest()
+        _, (r_h, s_h) = get_signature_parts(w.sign_transaction(tx_hash))
+        entries.append(((int(r_h, 16), int(s_h, 16)), tx_hash, w.public_key_point))
+
+    # Wrong hash, wrong key and out of range signature
+    (r, s), tx_hash, pk_point = entries[1]
+    entries[1] = ((r, s), sha256('bad_hash'.encode()).hexdigest(), pk_point)
+    entries[3] = (entries[3][0], entries[3][1], entries[4][2])
+    entries[5] = ((0, s), entries[5][1], entries[5][2])
+
+    results = curve.verify_signatures_batch(entries)
+    assert results == [True, False, True, False, True, False]
+    assert results == [curve.verify_signature(sig, h, pt) for sig, h, pt in entries[:5]] + [False]
+
+
+def test_public_key_cache():
+    curve = EllipticCurve(validation=EllipticCurve.VALIDATION_FAST, public_key_cache_size=2)
+    wallets = [Wallet() for _ in range(3)]
+
+    for w in wallets[:2] + wallets[:2]:
+        assert curve.get_public_key_point(w.compressed_public_key) == w.public_key_point
+    assert curve.public_key_cache.stats == {"hits": 2, "misses": 2, "size": 2, "maxsize": 2}
+
+    # Least recently used key is discarded
+    assert curve.get_public_key_point(wallets[2].compressed_public_key) == wallets[2].public_key_point
+    assert wallets[0].compressed_public_key not in curve.public_key_cache
+
+
+def test_glv_endomorphism():
+    '''
+    We verify the GLV decomposition and the endomorphism on the Bitcoin curve, and that other curves don't use it
+    '''
+    curve = EllipticCurve()
+    n = curve.order
+    assert curve.has_endomorphism
+    assert not small_curve().has_endomorphism
+
+    point = curve.scalar_multiplication(secrets.randbelow(n), curve.generator)
+    assert curve.endomorphism(point) == curve.affine_scalar_multiplication(curve.GLV_LAMBDA, point)
+
+    for _ in range(5):
+        k = secrets.randbelow(n)
+        k1, k2 = curve.glv_decomposition(k)
+        assert (k1 + k2 * curve.GLV_LAMBDA - k) % n == 0
+        assert abs(k1).bit_length() <= 129 and abs(k2).bit_length() <= 129
+        assert curve.scalar_multiplication(k, point) == curve.affine_scalar_multiplication(k, point)
+
+
+@pytest.mark.skipif(GMPY2_BACKEND not in ARITHMETIC_BACKENDS, reason='gmpy2 not installed')
+def test_arithmetic_backends():
+    '''
+    We verify the gmpy2 backend agrees with the Python backend and that both return tuples of Python ints
+    '''
+    python_curve = EllipticCurve(backend=PYTHON_BACKEND)
+    gmpy2_curve = EllipticCurve(backend=GMPY2_BACKEND)
+    w = Wallet()
+    point = w.public_key_point
+    n = secrets.randbelow(python_curve.order)
+
+    results = []
+    for curve in [python_curve, gmpy2_curve]:
+        curve_results = [
+            curve.scalar_multiplication(n, curve.generator),
+            curve.scalar_multiplication(n, point),
+            curve.multi_scalar_multiplication([n, n + 1], [curve.generator, point]),
+            curve.add_points(point, curve.generator),
+            curve.get_public_key_point(w.compressed_public_key)
+        ]
+        for result in curve_results:
+            assert all(type(v) is int for v in result)
+        results.append(curve_results)
+    assert results[0] == results[1]
+
+    tx_hash = sha256('backend'.encode()).hexdigest()
+    _, (r_h, s_h) = get_signature_parts(w.sign_transaction(tx_hash))
+    signature = (int(r_h, 16), int(s_h, 16))
+    assert python_curve.verify_signature(signature, tx_hash, point)
+    assert gmpy2_curve.verify_signature(signature, tx_hash, point)
+    assert gmpy2_curve.verify_signatures_batch([(signature, tx_hash, point)]) == [True]
+
+    # Module level methods return ints, whatever the number type they use
+    for number in ARITHMETIC_BACKENDS.values():
+        root = tonelli_shanks(4, SMALL_P, number)
+        assert type(root) is int and root in [2, SMALL_P - 2]
+        assert type(legendre_symbol(4, SMALL_P, number)) is int
+
+    # gmpy2 is opt-in
+    assert get_default_backend() == PYTHON_BACKEND and EllipticCurve().backend == PYTHON_BACKEND
+    set_default_backend(GMPY2_BACKEND)
+    try:
+        assert EllipticCurve().backend == GMPY2_BACKEND
+    finally:
+        set_default_backend(PYTHON_BACKEND)
+
+
+def test_find_group_order():
+    '''
+    We verify the vectorized, serial and parallel point counts agree, along with the legendre symbol and tonelli
+    shanks for p = 1 (mod 4)
+    '''
+    assert small_curve().find_group_order() == SMALL_ORDER
+
+    p = 1033
+    for a, b in [(0, 7), (2, 3), (-3, p + 5), (secrets.randbelow(p), secrets.randbelow(p))]:
+        count = count_points_chunk(a, b, p, 0, p)
+        assert count_points_vectorized(a, b, p, chunk_size=100) == count
+        assert count_points_parallel(a, b, p, workers=2) == count
+        assert EllipticCurve(a, b, p).find_group_order() == count + 1
+
+    squares = {(y * y) % p for y in range(1, p)}
+    for n in range(1, p):
+        assert legendre_symbol(n, p) == (1 if n in squares else -1)
+        if n in squares:
+            assert pow(tonelli_shanks(n, p), 2, p) == n
+        else:
+            assert tonelli_shanks(n, p) is None
+
+
+def test_batch_normalization():
+    '''
+    We verify the batch normalization and batch fixed-base multiplication agree with the single point versions
+    '''
+    for curve in [EllipticCurve(), small_curve()]:
+        scalars = [secrets.randbelow(curve.order) for _ in range(10)] + [0, curve.order]
+        jacobian_points = [curve.fixed_base_jacobian(n) for n in scalars]
+        assert curve.normalize_points(jacobian_points) == [curve.to_affine(point) for point in jacobian_points]
+        assert curve.batch_fixed_base_multiplication(scalars) == [curve.affine_scalar_multiplication(n, curve.generator)
+                                                                  for n in scalars]
+    assert EllipticCurve().normalize_points([]) == []
+
+
+def test_rfc6979_nonces():
+    '''
+    We check the deterministic nonces against the known secp256k1 test vectors for SHA256
+    '''
+    n = EllipticCurve.BITCOIN_GROUPORDER
+    vectors = [
+        (1, 'Satoshi Nakamoto', 0x8f8a276c19f4149656b280621e358cce24f5f52542772691ee69063b74f15d15),
+        (1, 'All those moments will be lost in time, like tears in rain. Time to die...',
+         0x38aa22d72376b4dbc472e06c3ba403ee0a394da63fc58d88686c611aba98d6b3),
+        (n - 1, 'Satoshi Nakamoto', 0x33a19b60e25fb6f4435af53a3d42d493644827367e6453928554f43e49aa6f90)
+    ]
+    for private_key, message, k in vectors:
+        tx_hash = sha256(message.encode()).hexdigest()
+        nonces = rfc6979_nonces(private_key, tx_hash, n)
+        assert next(nonces) == k
+        assert 1 <= next(nonces) < n
+
+    # Candidates for small orders stay in range
+    nonces = rfc6979_nonces(5, sha256('small'.encode()).hexdigest(), SMALL_ORDER)
+    assert all(1 <= next(nonces) < SMALL_ORDER for _ in range(20))
@@ -5,7 +5,9 @@ Test for the various helper functions
 '''
 IMPORTS
 '''
-from helpers import int_to_base58, base58_to_int, get_signature_parts, verify_address_checksum
+from helpers import int_to_base58, base58_to_int, get_signature_parts, verify_address_checksum, LRUCache, \
+    ints_to_base58, base58_to_ints, bytes_to_base58, base58_to_bytes
+import pytest
 import secrets
 from wallet import Wallet
 from tests.testing_functions import generate_transaction
@@ -25,6 +27,22 @@ def test_base58():
     addy2 = int_to_base58(int(hex_val, 16))
     assert addy1 == addy2
 
+    # Edge cases
+    assert int_to_base58(0) == '1' and base58_to_int('1') == 0
+    assert int_to_base58(57) == 'z' and int_to_base58(58) == '21'
+    with pytest.raises(ValueError):
+        base58_to_int('0OIl')
+
+    # Bulk API
+    nums = [secrets.randbits(192) for _ in range(10)]
+    assert ints_to_base58(nums) == [int_to_base58(num) for num in nums]
+    assert base58_to_ints(ints_to_base58(nums)) == nums
+
+    # Bytes API keeps the leading zero bytes
+    assert bytes_to_base58(b'hello world') == 'StV1DL6CwTryKyV'
+    for data in [b'', b'\x00', b'\x00\x00\x01', b'\x00' + secrets.token_bytes(24)]:
+        assert base58_to_bytes(bytes_to_base58(data)) == data
+
 
 def test_signature_parts():
     tx = generate_transaction()
@@ -41,3 +59,24 @@ def test_address():
     w = Wallet()
     addy = w.address
     assert verify_address_checksum(addy)
+
+
+def test_lru_cache():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+    assert cache.stats == {"hits": 2, "misses": 1, "size": 2, "maxsize": 2}
+
+    cache.resize(1)
+    assert len(cache) == 1 and 'c' in cache
+    cache.discard('c')
+    assert len(cache) == 0
+
+    disabled = LRUCache(0)
+    disabled.put('a', 1)
+    assert disabled.get('a') is None
@@ -0,0 +1,69 @@
+'''
+Testing the binary serialization
+'''
+import secrets
+from hashlib import sha256
+from utxo import UTXO_INPUT, UTXO_OUTPUT, decode_binary_input_utxo, decode_binary_output_utxo
+from transaction import Transaction, GenesisTransaction, MiningTransaction, decode_binary_transaction
+from block import Block, decode_binary_block
+from serialization import hex_to_binary, binary_to_hex, decode_frame, encode_frame, negotiate_format_version, \
+    INPUT_UTXO, OUTPUT_UTXO, TRANSACTION, BLOCK, FORMAT_VERSION, HEX_FORMAT_VERSION
+from wallet import Wallet
+
+
+def test_binary_utxo():
+    w = Wallet()
+    tx_id = sha256('tx_id'.encode()).hexdigest()
+    input_utxo = UTXO_INPUT(tx_id, 3, w.sign_transaction(tx_id))
+    output_utxo = UTXO_OUTPUT(secrets.randbelow(1000), Wallet().address)
+
+    # Binary forms are about half the size of the hex forms, and decode at an offset
+    assert len(input_utxo.binary_utxo) < len(input_utxo.raw_utxo) // 2 + 2
+    buffer = b'\x00' + input_utxo.binary_utxo + output_utxo.binary_utxo
+    input_utxo2, index = decode_binary_input_utxo(buffer, 1)
+    output_utxo2, end = decode_binary_output_utxo(buffer, index)
+    assert input_utxo2.raw_utxo == input_utxo.raw_utxo
+    assert output_utxo2.raw_utxo == output_utxo.raw_utxo
+    assert end == len(buffer)
+
+    assert binary_to_hex(hex_to_binary(input_utxo.raw_utxo, INPUT_UTXO)) == input_utxo.raw_utxo
+    assert binary_to_hex(hex_to_binary(output_utxo.raw_utxo, OUTPUT_UTXO)) == output_utxo.raw_utxo
+
+
+def test_binary_transaction_and_block():
+    w = Wallet()
+    tx_ids = [sha256(f'tx_id {x}'.encode()).hexdigest() for x in range(2)]
+    inputs = [UTXO_INPUT(tx_id, x, w.sign_transaction(tx_id)).raw_utxo for x, tx_id in enumerate(tx_ids)]
+    outputs = [UTXO_OUTPUT(secrets.randbelow(1000), Wallet().address).raw_utxo for _ in range(3)]
+    mining_output = UTXO_OUTPUT(50, w.address).raw_utxo
+    transactions = [Transaction(inputs, outputs), GenesisTransaction(), MiningTransaction(12, 50, mining_output)]
+
+    for tx in transactions:
+        tx2, end = decode_binary_transaction(tx.binary_tx)
+        assert tx2.raw_tx == tx.raw_tx and tx2.id == tx.id
+        assert end == len(tx.binary_tx)
+        assert binary_to_hex(hex_to_binary(tx.raw_tx, TRANSACTION)) == tx.raw_tx
+
+    block = Block(sha256('prev'.encode()).hexdigest(), 30, secrets.randbelow(1000), [t.raw_tx for t in transactions])
+    block2, end = decode_binary_block(block.binary_block)
+    assert block2.raw_block == block.raw_block and end == len(block.binary_block)
+    assert len(block.binary_block) < len(block.raw_block)
+    assert binary_to_hex(hex_to_binary(block.raw_block, BLOCK)) == block.raw_block
+    assert binary_to_hex(hex_to_binary(block.raw_block, BLOCK, HEX_FORMAT_VERSION)) == block.raw_block
+
+
+def test_frame_version():
+    frame = encode_frame(b'\x01\x02', TRANSACTION)
+    version, kind, payload = decode_frame(frame)
+    assert (version, kind, bytes(payload)) == (FORMAT_VERSION, TRANSACTION, b'\x01\x02')
+
+    for bad_frame in [b'\xff' + frame[1:], frame + b'\x00']:
+        try:
+            decode_frame(bad_frame)
+            assert False
+        except AssertionError as e:
+            assert str(e)
+
+    assert negotiate_format_version([HEX_FORMAT_VERSION, FORMAT_VERSION, 7]) == FORMAT_VERSION
+    assert negotiate_format_version([HEX_FORMAT_VERSION]) == HEX_FORMAT_VERSION
+    assert negotiate_format_version([]) == HEX_FORMAT_VERSION
@@ -4,7 +4,8 @@ Testing transactions
 import random
 import string
 import numpy as np
-from transaction import Transaction, decode_raw_transaction, GenesisTransaction, MiningTransaction
+from transaction import Transaction, decode_raw_transaction, GenesisTransaction, MiningTransaction, \
+    parse_raw_transaction, FrozenTransaction
 from utxo import UTXO_OUTPUT, UTXO_INPUT
 import secrets
 from hashlib import sha256
@@ -64,4 +65,69 @@ def test_mining_transaction():
 
     assert mt1.raw_tx == mt2.raw_tx
     assert int(mt2.height, 16) == random_height
-    assert int(mt2.reward, 16) == random_reward
\ No newline at end of file
+
+    # A decoded output is used as is
+    mt3 = MiningTransaction(random_height, random_reward, output1)
+    assert mt3.raw_tx == mt1.raw_tx and mt3.mining_output is output1
+    assert int(mt2.reward, 16) == random_reward
+
+
+def test_immutable_transaction():
+    '''
+    We verify the raw tx and id are computed once, and that transactions can't be changed after construction
+    '''
+    w = Wallet()
+    output1 = UTXO_OUTPUT(secrets.randbelow(1000), w.address)
+    tx_id = sha256('tx_id'.encode()).hexdigest()
+    input1 = UTXO_INPUT(tx_id, 0, w.sign_transaction(tx_id))
+    transactions = [Transaction([input1.raw_utxo], [output1.raw_utxo]), GenesisTransaction(),
+                    MiningTransaction(1, 50, output1.raw_utxo)]
+
+    for t in transactions:
+        assert t.id is t.id and t.raw_tx is t.raw_tx
+        assert t.id == sha256(t.raw_tx.encode()).hexdigest()
+        assert not hasattr(t, '__dict__')
+        for name in ['type', 'id', 'new_field']:
+            try:
+                setattr(t, name, '00')
+                assert False
+            except AttributeError:
+                pass
+    assert isinstance(transactions[0].inputs, tuple) and isinstance(transactions[0].outputs, tuple)
+
+    # The utxos are immutable too, so the cached raw tx can't go stale
+    for utxo, name in [(transactions[0].inputs[0], 'tx_index'), (transactions[0].outputs[0], 'amount')]:
+        try:
+            setattr(utxo, name, '00')
+            assert False
+        except AttributeError:
+            pass
+        assert not hasattr(utxo, '__dict__')
+
+    try:
+        FrozenTransaction()
+        assert False
+    except TypeError:
+        pass
+
+
+def test_parse_raw_transaction():
+    '''
+    We parse transactions of each type back to back from one string and check the returned indices
+    '''
+    w = Wallet()
+    output1 = UTXO_OUTPUT(secrets.randbelow(1000), w.address)
+    tx_ids = [sha256(f'tx_id {x}'.encode()).hexdigest() for x in range(3)]
+    inputs = [UTXO_INPUT(tx_id, x, w.sign_transaction(tx_id)) for x, tx_id in enumerate(tx_ids)]
+    transactions = [Transaction([i.raw_utxo for i in inputs], [output1.raw_utxo, output1.raw_utxo]),
+                    GenesisTransaction(), MiningTransaction(7, 50, output1.raw_utxo)]
+
+    raw = '00' + ''.join([t.raw_tx for t in transactions])
+    index = 2
+    for t in transactions:
+        new_t, index = parse_raw_transaction(raw, index)
+        assert new_t.raw_tx == t.raw_tx
+    assert index == len(raw)
+
+    # Decoded utxo objects can be passed directly
+    assert Transaction(inputs, [output1]).raw_tx == Transaction([i.raw_utxo for i in inputs], [output1.raw_utxo]).raw_tx
@@ -4,7 +4,9 @@ UTXO Testing
 import random
 import string
 from hashlib import sha256
-from utxo import UTXO_INPUT, UTXO_OUTPUT, decode_raw_input_utxo, decode_raw_output_utxo
+from utxo import UTXO_INPUT, UTXO_OUTPUT, decode_raw_input_utxo, decode_raw_output_utxo, address_to_cepk, \
+    cepk_to_address, address_cache_stats
+from helpers import base58_to_int, int_to_base58
 import secrets
 from wallet import Wallet
 import numpy as np
@@ -35,3 +37,29 @@ def test_raw_output():
     output2 = decode_raw_output_utxo(raw1)
 
     assert output2.raw_utxo == raw1
+
+
+def test_address_cache():
+    '''
+    We verify the cached conversions agree with the direct ones and that each conversion fills both directions
+    '''
+    address = Wallet().address
+    cepk = address_to_cepk(address)
+    assert cepk == hex(base58_to_int(address))[2:]
+
+    stats = address_cache_stats()
+    assert cepk_to_address(cepk) == address
+    assert address_cache_stats()["cepk_to_address"]["hits"] == stats["cepk_to_address"]["hits"] + 1
+
+    other_cepk = hex(base58_to_int(Wallet().address))[2:]
+    other_address = cepk_to_address(other_cepk)
+    assert other_address == int_to_base58(int(other_cepk, 16))
+    assert address_to_cepk(other_address) == other_cepk
+    assert address_cache_stats()["address_to_cepk"]["hits"] == stats["address_to_cepk"]["hits"] + 1
+
+    # A cepk with a leading zero decodes to the same address, but doesn't change its encoding
+    address = Wallet().address
+    cepk = hex(base58_to_int(address))[2:]
+    assert cepk_to_address('0' + cepk) == address
+    assert address_to_cepk(address) == cepk
+    assert UTXO_OUTPUT(5, address).cepk == cepk
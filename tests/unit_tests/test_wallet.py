@@ -7,7 +7,10 @@ Imports
 '''
 import secrets
 import numpy as np
-from wallet import Wallet
+import wallet
+from concurrent.futures import ThreadPoolExecutor
+from wallet import Wallet, UTXOIndex, address_from_public_key, compress_public_key, load_dictionary, load_word_index, \
+    random_seed, generate_key_batch
 from hashlib import sha256
 from helpers import get_signature_parts
 
@@ -88,3 +91,174 @@ def test_signature():
 
     assert w.curve.verify_signature(sig, tx_hash1, w.public_key_point)
     assert not w.curve.verify_signature(sig, tx_hash2, w.public_key_point)
+
+    # Signatures are deterministic, with or without verification
+    assert w.sign_transaction(tx_hash1) == w.sign_transaction(tx_hash1, verify=False)
+    assert w.sign_transaction(tx_hash1) != w.sign_transaction(tx_hash2)
+
+
+def test_batch_signature():
+    w = Wallet()
+    tx_hashes = [sha256(f'tx_hash {x}'.encode()).hexdigest() for x in range(5)]
+
+    sigs = w.sign_transactions(tx_hashes)
+    assert len(sigs) == len(tx_hashes)
+    for sig, tx_hash in zip(sigs, tx_hashes):
+        cpk, (r_h, s_h) = get_signature_parts(sig)
+        assert cpk == w.compressed_public_key
+        assert w.curve.verify_signature((int(r_h, 16), int(s_h, 16)), tx_hash, w.public_key_point)
+    assert w.sign_transactions([]) == []
+    assert sigs == [w.sign_transaction(tx_hash) for tx_hash in tx_hashes]
+    assert sigs == w.sign_transactions(tx_hashes, verify=False)
+
+
+def test_generate_many():
+    '''
+    We verify the batch generated wallets and records agree with wallets created one at a time
+    '''
+    for workers in [1, 2]:
+        wallets = Wallet.generate_many(4, workers=workers)
+        assert len(wallets) == 4
+        for w in wallets:
+            w2 = Wallet(seed=w.recover_seed(w.seed_phrase))
+            assert w.master_keys == w2.master_keys
+            assert w.address == w2.address
+            assert w.chain_code == w2.chain_code
+            assert w.seed_phrase == w2.seed_phrase
+
+        records = Wallet.generate_many(4, records=True, workers=workers)
+        assert len(records) == 4
+        for address, private_key in records:
+            w = Wallet()
+            public_key_point = w.curve.scalar_multiplication(int(private_key, 16), w.curve.generator)
+            assert address == address_from_public_key(compress_public_key(public_key_point), 32)
+    assert Wallet.generate_many(0) == []
+
+    # Keys are only accepted with the seed they came from
+    seed, other_seed = random_seed(128), random_seed(128)
+    keys = generate_key_batch([seed])[0]
+    assert Wallet(seed=seed, _keys=keys).address == Wallet(seed=seed).address
+    for kwargs in [{'_keys': keys}, {'seed': other_seed, '_keys': keys}]:
+        try:
+            Wallet(**kwargs)
+            assert False
+        except AssertionError as e:
+            assert str(e)
+
+
+def test_dictionary():
+    words = load_dictionary()
+    index_dict = load_word_index()
+    assert len(words) == pow(2, Wallet.DICT_EXP)
+    assert load_dictionary() is words
+    assert all(index_dict[word] == index for index, word in enumerate(words))
+    assert words[:2] == ['abandon', 'ability'] and isinstance(words[index_dict['true']], str)
+
+    # Concurrent first loads publish a single complete list and index
+    wallet.word_list, wallet.word_index = None, None
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: (load_dictionary(), load_word_index()), range(8)))
+    assert all(words is results[0][0] and index_dict is results[0][1] for words, index_dict in results)
+    assert len(results[0][0]) == pow(2, Wallet.DICT_EXP) and results[0][1]['ability'] == 1
+
+
+def bip32_wallet(private_key: int, chain_code: int):
+    '''
+    Returns a Wallet with the given master keys, as the BIP32 test vectors don't come from a seed of ours.
+    '''
+    w = Wallet()
+    x, y = w.curve.scalar_multiplication(private_key, w.curve.generator)
+    w.master_keys = (hex(x), hex(y)), hex(private_key)
+    w.chain_code = chain_code
+    return w
+
+
+def test_child_key_derivation():
+    '''
+    We check the child keys against BIP32 test vector 1 - the hardened child m/0H of the master keys, and the normal
+    child m/0H/1 - then check the batch derivation and caching
+    '''
+    w = Wallet()
+    master_key = 0xe8f32e723decf4051aefac8e2c93c9c5b214313817cdb01a1494b917c8436b35
+    master_chain_code = 0x873dff81c02f525623fd1fe5167eac3a55a049de3d314bb42ee227ffed37d508
+    master = bip32_wallet(master_key, master_chain_code)
+
+    child_key, child_chain_code, child_point = master.derive_child(Wallet.HARDENED_INDEX)
+    assert child_key == 0xedb2e14f9ee77d26dd93b4ecede8d16ed408ce149b6cd80b0715a2d911a0afea
+    assert child_chain_code == 0x47fdacbd0f1097043b78c63c20c34ef4ed9a111d980047ad16282c7ae6236141
+
+    child = bip32_wallet(child_key, child_chain_code)
+    grandchild_key, grandchild_chain_code, grandchild_point = child.derive_child(1)
+    assert grandchild_key == 0x3c6cb8d0f6a264c91ea8b5030fadaa8e538b020f0a387421a12de9319dc93368
+    assert grandchild_chain_code == 0x2a7857631386ba23dacac34180dd1983734e444fdbf774041578e9b6adb37c19
+    assert grandchild_point == w.curve.scalar_multiplication(grandchild_key, w.curve.generator)
+
+    # Batch derivation agrees with single derivation and fills the cache
+    children = w.derive_children(0, 10)
+    assert len(w.child_keys) == 10
+    assert children[3] == w.derive_child(3)
+    assert w.child_keys.stats["hits"] == 1
+    assert w.child_addresses(2, 4) == [address_from_public_key(compress_public_key(point), 32)
+                                       for _, _, point in children[2:4]]
+
+
+def test_utxo_index():
+    '''
+    We apply the utxo changes of added and popped blocks and check the owned utxos and balances
+    '''
+    w = Wallet()
+    child_address = w.child_addresses(0, 1)[0]
+    other_address = Wallet().address
+    index = UTXOIndex([w.address, child_address])
+
+    # Added blocks
+    tx_id1 = sha256('tx_id1'.encode()).hexdigest()
+    tx_id2 = sha256('tx_id2'.encode()).hexdigest()
+    block1 = [(tx_id1, 0, format(50, '016x'), w.address), (tx_id1, 1, format(20, '016x'), other_address)]
+    block2 = [(tx_id2, 1, format(30, '016x'), child_address), (tx_id2, 2, format(15, '016x'), w.address)]
+    index.update(block1, [])
+    index.update(block2, [block1[0]])
+    assert index.balance == 45
+    assert index.balance_of(child_address) == 30 and index.balance_of(other_address) == 0
+    assert sorted(index.spendable) == sorted([(tx_id2, 1, 30, child_address), (tx_id2, 2, 15, w.address)])
+
+    # Popped block restores the consumed output
+    index.update([block1[0]], block2)
+    assert index.balance == 50 and len(index) == 1 and (tx_id1, 0) in index
+
+    # Loading replaces the index
+    index.load(block2)
+    assert index.balance == 45 and len(index) == 2
+    assert w.balance == 0
+
+
+def test_create_transaction():
+    '''
+    We create transactions from the utxo index and check the inputs, outputs, signatures and reservations
+    '''
+    w = Wallet()
+    receiver = Wallet().address
+    tx_ids = [sha256(f'tx_id {x}'.encode()).hexdigest() for x in range(4)]
+    w.utxo_index.load([(tx_id, 1, amount, w.address) for tx_id, amount in zip(tx_ids, [50, 20, 30, 5])])
+
+    # A single utxo is preferred to an exact match with more inputs, and change returns to the wallet
+    tx = w.create_transaction(receiver, 30, fee=5)
+    assert [i.tx_id for i in tx.inputs] == [tx_ids[0]]
+    assert int(tx.outputs[0].amount, 16) == 30 and tx.outputs[0].address == receiver
+    assert int(tx.outputs[1].amount, 16) == 15 and tx.outputs[1].address == w.address
+    _, (r_h, s_h) = get_signature_parts(tx.inputs[0].signature)
+    assert w.curve.verify_signature((int(r_h, 16), int(s_h, 16)), tx.inputs[0].tx_id, w.public_key_point)
+
+    # Reserved utxos aren't spent again, and an exact match with no more inputs needs no change
+    tx = w.create_transaction(receiver, 50)
+    assert {i.tx_id for i in tx.inputs} == {tx_ids[1], tx_ids[2]} and len(tx.outputs) == 1
+    for i in tx.inputs:
+        _, (r_h, s_h) = get_signature_parts(i.signature)
+        assert w.curve.verify_signature((int(r_h, 16), int(s_h, 16)), i.tx_id, w.public_key_point)
+    assert w.create_transaction(receiver, 6) is None
+
+    # Released when consumed by a Block
+    w.utxo_index.update([], [(tx_ids[0], 1, 50, w.address)])
+    w.utxo_index.release([(tx_ids[1], 1)])
+    assert w.utxo_index.spendable == [(tx_ids[1], 1, 20, w.address), (tx_ids[3], 1, 5, w.address)]
+    assert w.balance == 55
@@ -51,18 +51,52 @@ import string
 '''
 IMPORTS
 '''
-from utxo import decode_raw_output_utxo, decode_raw_input_utxo, UTXO_INPUT, UTXO_OUTPUT
+from utxo import decode_raw_output_utxo, decode_raw_input_utxo, UTXO_INPUT, UTXO_OUTPUT, decode_binary_input_utxo, \
+    decode_binary_output_utxo, parse_raw_input_utxo, parse_raw_output_utxo
 from hashlib import sha256
+from abc import ABC, abstractmethod
+from helpers import hex_to_bytes, bytes_to_int, Frozen
 
 '''
 TRANSACTION 
 '''
 
 
-class Transaction:
+class FrozenTransaction(Frozen, ABC):
+    '''
+    The base class of the transaction types. A transaction - and the utxos it holds - can't be changed once
+    constructed, so we compute the raw tx and id on first use and keep them. Each subclass lists its fields in
+    __slots__, sets them in __init__ and then calls freeze, and gives its raw tx in build_raw_tx.
+    '''
+    __slots__ = ('_raw_tx', '_id')
+
+    def freeze(self):
+        self._raw_tx = None
+        self._id = None
+        super().freeze()
+
+    @abstractmethod
+    def build_raw_tx(self):
+        pass
+
+    @property
+    def raw_tx(self):
+        if self._raw_tx is None:
+            object.__setattr__(self, '_raw_tx', self.build_raw_tx())
+        return self._raw_tx
+
+    @property
+    def id(self):
+        if self._id is None:
+            object.__setattr__(self, '_id', sha256(self.raw_tx.encode()).hexdigest())
+        return self._id
+
+
+class Transaction(FrozenTransaction):
     '''
 
     '''
+    __slots__ = ('type', 'version', 'inputs', 'outputs', 'input_num', 'output_num')
     COUNT_BITS = 8
     MIN_HEIGHT_BITS = 32
     VERSION_BITS = 8
@@ -71,7 +105,8 @@ class Transaction:
     def __init__(self, inputs: list, outputs: list, version=1):
         '''
         A Transaction can be instantiated with a list of inputs - which will be a list of raw utxo_input values - and
-        a list of outputs - which will be a list of raw utxo_output values. The minimum height represents the minimum
+        a list of outputs - which will be a list of raw utxo_output values. Already decoded UTXO_INPUT and UTXO_OUTPUT
+        objects are accepted as well, and are used as is. The minimum height represents the minimum
         block height in which that Transaction can be saved to the chain. If set to 0, it is valid to be accepted in
         any Block. This field will be used primarily by mining Transactions, in order to establish its validity. Version we fix to 1 for the time being.
         '''
@@ -82,48 +117,46 @@ class Transaction:
         self.version = format(version, f'0{self.VERSION_BITS // 4}x')
 
         # Iterate over raw input utxo's and store the objects
-        self.inputs = []
-        for i in inputs:
-            input_utxo = decode_raw_input_utxo(i)
-            self.inputs.append(input_utxo)
+        self.inputs = tuple(decode_raw_input_utxo(i) if isinstance(i, str) else i for i in inputs)
 
         # Iterate over raw output utxo's and store the objects
-        self.outputs = []
-        for t in outputs:
-            output_utxo = decode_raw_output_utxo(t)
-            self.outputs.append(output_utxo)
+        self.outputs = tuple(decode_raw_output_utxo(t) if isinstance(t, str) else t for t in outputs)
 
         # Get hex string for counts
         self.input_num = format(len(self.inputs), f'0{self.COUNT_BITS // 4}x')
         self.output_num = format(len(self.outputs), f'0{self.COUNT_BITS // 4}x')
 
+        self.freeze()
+
     '''
     PROPERTIES
     '''
 
-    @property
-    def raw_tx(self):
-        input_string = ''
-        output_string = ''
-
-        for i in self.inputs:
-            input_string += i.raw_utxo
-
-        for t in self.outputs:
-            output_string += t.raw_utxo
-
+    def build_raw_tx(self):
+        input_string = ''.join([i.raw_utxo for i in self.inputs])
+        output_string = ''.join([t.raw_utxo for t in self.outputs])
         return self.type + self.input_num + input_string + self.output_num + output_string + self.version
 
     @property
-    def id(self):
-        return sha256(self.raw_tx.encode()).hexdigest()
+    def binary_tx(self):
+        '''
+        The binary form has the same field order as the raw tx, with the binary utxos.
+        '''
+        return b''.join([hex_to_bytes(self.type, self.TYPE_BITS // 8),
+                         hex_to_bytes(self.input_num, self.COUNT_BITS // 8)]
+                        + [i.binary_utxo for i in self.inputs]
+                        + [hex_to_bytes(self.output_num, self.COUNT_BITS // 8)]
+                        + [t.binary_utxo for t in self.outputs]
+                        + [hex_to_bytes(self.version, self.VERSION_BITS // 8)])
 
 
-class GenesisTransaction:
+class GenesisTransaction(FrozenTransaction):
     '''
     The Genesis Transaction for the Genesis Block.
     All values in the Genesis Block should be utilzed by the Blockchain - nothing else should be hardcoded except the values in the Genesis tx and Block
     '''
+    __slots__ = ('type', 'acoeff', 'bcoeff', 'prime', 'generator_x', 'generator_y', 'group_order', 'amount_to_mine',
+                 'starting_reward', 'starting_target', 'heartbeat')
 
     '''
     FORMATTING BITS
@@ -188,19 +221,35 @@ class GenesisTransaction:
         # Format heartbeat
         self.heartbeat = format(heartbeat, f'0{self.HEARTBEAT_BITS // 4}x')
 
-    @property
-    def raw_tx(self):
+        self.freeze()
+
+    def build_raw_tx(self):
         return self.type + self.acoeff + self.bcoeff + self.prime + self.generator_x + self.generator_y + self.group_order + self.amount_to_mine + self.starting_reward + self.starting_target + self.heartbeat
 
     @property
-    def id(self):
-        return sha256(self.raw_tx.encode()).hexdigest()
+    def binary_tx(self):
+        return b''.join(hex_to_bytes(value, bits // 8) for value, bits in zip(self.field_values, self.field_bits()))
 
+    @property
+    def field_values(self):
+        return [self.type, self.acoeff, self.bcoeff, self.prime, self.generator_x, self.generator_y, self.group_order,
+                self.amount_to_mine, self.starting_reward, self.starting_target, self.heartbeat]
 
-class MiningTransaction:
+    @classmethod
+    def field_bits(cls):
+        '''
+        The bit sizes of the fields in field_values.
+        '''
+        return [Transaction.TYPE_BITS, cls.ACOEFF_BITS, cls.BCOEFF_BITS, cls.PRIME_BITS, cls.GENERATOR_COORD_BITS,
+                cls.GENERATOR_COORD_BITS, cls.GROUP_ORDER_BITS, cls.MINE_AMOUNT_BITS, cls.MINE_REWARD_BITS,
+                cls.TARGET_BITS, cls.HEARTBEAT_BITS]
+
+
+class MiningTransaction(FrozenTransaction):
     '''
 
     '''
+    __slots__ = ('type', 'height', 'reward', 'output_length', 'mining_output')
     '''
     BIT VALUES
     '''
@@ -208,9 +257,9 @@ class MiningTransaction:
     REWARD_BITS = 32
     OUTPUT_LENGTH_BITS = 8
 
-    def __init__(self, height: int, reward: int, raw_utxo_output: str):
+    def __init__(self, height: int, reward: int, raw_utxo_output):
         '''
-
+        The mining output can be given as a raw utxo_output or as an already decoded UTXO_OUTPUT object.
         '''
         # Fix type
         self.type = format(2, f'0{Transaction.TYPE_BITS // 4}x')
@@ -221,19 +270,26 @@ class MiningTransaction:
         # Format reward
         self.reward = format(reward, f'0{self.REWARD_BITS // 4}x')
 
+        # Get raw output and save as UTXO_OUTPUT object
+        if isinstance(raw_utxo_output, str):
+            raw_utxo_output = decode_raw_output_utxo(raw_utxo_output)
+        self.mining_output = raw_utxo_output
+
         # Get and format output length
-        self.output_length = format(len(raw_utxo_output), f'0{self.OUTPUT_LENGTH_BITS // 4}x')
+        self.output_length = format(len(self.mining_output.raw_utxo), f'0{self.OUTPUT_LENGTH_BITS // 4}x')
 
-        # Get raw output and save as UTXO_OUTPUT object
-        self.mining_output = decode_raw_output_utxo(raw_utxo_output)
+        self.freeze()
 
-    @property
-    def raw_tx(self):
+    def build_raw_tx(self):
         return self.type + self.height + self.reward + self.output_length + self.mining_output.raw_utxo
 
     @property
-    def id(self):
-        return sha256(self.raw_tx.encode()).hexdigest()
+    def binary_tx(self):
+        '''
+        The binary form drops the output length, as the binary output is self-delimiting.
+        '''
+        return (hex_to_bytes(self.type, Transaction.TYPE_BITS // 8) + hex_to_bytes(self.height, self.HEIGHT_BITS // 8)
+                + hex_to_bytes(self.reward, self.REWARD_BITS // 8) + self.mining_output.binary_utxo)
 
 
 '''
@@ -242,99 +298,119 @@ Decoding
 
 
 def decode_raw_transaction(raw_tx: str):
+    return parse_raw_transaction(raw_tx)[0]
+
+
+def parse_raw_transaction(raw: str, offset=0):
     '''
-    We decode the raw transaction using the raw_tx string and bit constants.
+    We decode the raw transaction starting at the offset of the string using the bit constants. We move a single index
+    through the string, slicing out only the fields, so that each utxo is decoded once and nothing is re-serialized to
+    find its length. Returns the transaction and the index following it.
     '''
     # Get type
-    type_index = Transaction.TYPE_BITS // 4
-    type = int(raw_tx[:type_index], 16)
+    type_index = offset + Transaction.TYPE_BITS // 4
+    type = int(raw[offset:type_index], 16)
 
     if type == 0:
-        # Set index vars
-        acoeff_index = GenesisTransaction.ACOEFF_BITS // 4
-        bcoeff_index = GenesisTransaction.BCOEFF_BITS // 4
-        prime_index = GenesisTransaction.PRIME_BITS // 4
-        generator_index = GenesisTransaction.GENERATOR_COORD_BITS // 4
-        order_index = GenesisTransaction.GROUP_ORDER_BITS // 4
-        mine_amount_index = GenesisTransaction.MINE_AMOUNT_BITS // 4
-        reward_index = GenesisTransaction.MINE_REWARD_BITS // 4
-        target_index = GenesisTransaction.TARGET_BITS // 4
-        hearbeat_index = GenesisTransaction.HEARTBEAT_BITS // 4
-
-        index1 = type_index
-        index2 = index1 + acoeff_index
-        index3 = index2 + bcoeff_index
-        index4 = index3 + prime_index
-        index5 = index4 + generator_index
-        index6 = index5 + generator_index
-        index7 = index6 + order_index
-        index8 = index7 + mine_amount_index
-        index9 = index8 + reward_index
-        index10 = index9 + target_index
-        index11 = index10 + hearbeat_index
-
-        a = int(raw_tx[index1:index2], 16)
-        b = int(raw_tx[index2:index3], 16)
-        p = int(raw_tx[index3:index4], 16)
-        gx = int(raw_tx[index4:index5], 16)
-        gy = int(raw_tx[index5:index6], 16)
-        order = int(raw_tx[index6:index7], 16)
-        mine_amount = int(raw_tx[index7:index8], 16)
-        reward = int(raw_tx[index8:index9], 16)
-        target = int(raw_tx[index9:index10], 16)
-        hearbeat = int(raw_tx[index10:index11], 16)
-
+        values = []
+        index = offset
+        for bits in GenesisTransaction.field_bits():
+            values.append(int(raw[index:index + bits // 4], 16))
+            index += bits // 4
+        _, a, b, p, gx, gy, order, mine_amount, reward, target, heartbeat = values
         return GenesisTransaction(a_coeff=a, b_coeff=b, prime=p, generator_x=gx, generator_y=gy, group_order=order,
-                                  mine_amount=mine_amount, reward=reward, target=target, heartbeat=hearbeat)
+                                  mine_amount=mine_amount, reward=reward, target=target, heartbeat=heartbeat), index
 
     elif type == 2:
         # Set index variables
-        height_index = MiningTransaction.HEIGHT_BITS // 4
-        reward_index = MiningTransaction.REWARD_BITS // 4
-        output_length_index = MiningTransaction.OUTPUT_LENGTH_BITS // 4
-
         index1 = type_index
-        index2 = index1 + height_index
-        index3 = index2 + reward_index
-        index4 = index3 + output_length_index
+        index2 = index1 + MiningTransaction.HEIGHT_BITS // 4
+        index3 = index2 + MiningTransaction.REWARD_BITS // 4
+        index4 = index3 + MiningTransaction.OUTPUT_LENGTH_BITS // 4
 
-        height = int(raw_tx[index1:index2], 16)
-        reward = int(raw_tx[index2:index3], 16)
-        output_length = int(raw_tx[index3:index4], 16)
+        height = int(raw[index1:index2], 16)
+        reward = int(raw[index2:index3], 16)
+        output_length = int(raw[index3:index4], 16)
 
         index5 = index4 + output_length
-        raw_output = raw_tx[index4:index5]
-        return MiningTransaction(height, reward, raw_output)
+        return MiningTransaction(height, reward, raw[index4:index5]), index5
 
     else:
-
         # Set index variables
         count_index = Transaction.COUNT_BITS // 4
         version_index = Transaction.VERSION_BITS // 4
 
-        # Get input num
-        input_num = int(raw_tx[type_index:type_index + count_index], 16)
-
         # Get inputs
+        input_num = int(raw[type_index:type_index + count_index], 16)
+        index = type_index + count_index
         inputs = []
-        temp_index = type_index + count_index  # We use temp_index as the shifting string index throughout
         for x in range(0, input_num):
-            raw_input_utxo = decode_raw_input_utxo(raw_tx[temp_index:]).raw_utxo
-            inputs.append(raw_input_utxo)
-            temp_index += len(raw_input_utxo)
+            input_utxo, index = parse_raw_input_utxo(raw, index)
+            inputs.append(input_utxo)
+
+        # Get outputs
+        output_num = int(raw[index:index + count_index], 16)
+        index += count_index
+        outputs = []
+        for y in range(0, output_num):
+            output_utxo, index = parse_raw_output_utxo(raw, index)
+            outputs.append(output_utxo)
 
-        # Get output num
-        output_num = int(raw_tx[temp_index: temp_index + count_index], 16)
+        # Get version
+        version = int(raw[index:index + version_index], 16)
+
+        return Transaction(inputs=inputs, outputs=outputs, version=version), index + version_index
+
+
+def decode_binary_transaction(buffer, offset=0):
+    '''
+    Decodes the binary transaction of any type starting at the offset of the buffer. Returns the transaction and the
+    offset following it.
+    '''
+    type_bytes = Transaction.TYPE_BITS // 8
+    type = bytes_to_int(buffer, offset, type_bytes)
+
+    if type == 0:
+        values = []
+        index = offset
+        for bits in GenesisTransaction.field_bits():
+            values.append(bytes_to_int(buffer, index, bits // 8))
+            index += bits // 8
+        _, a, b, p, gx, gy, order, mine_amount, reward, target, heartbeat = values
+        return GenesisTransaction(a_coeff=a, b_coeff=b, prime=p, generator_x=gx, generator_y=gy, group_order=order,
+                                  mine_amount=mine_amount, reward=reward, target=target, heartbeat=heartbeat), index
+
+    elif type == 2:
+        index1 = offset + type_bytes
+        index2 = index1 + MiningTransaction.HEIGHT_BITS // 8
+        index3 = index2 + MiningTransaction.REWARD_BITS // 8
+        height = bytes_to_int(buffer, index1, MiningTransaction.HEIGHT_BITS // 8)
+        reward = bytes_to_int(buffer, index2, MiningTransaction.REWARD_BITS // 8)
+        mining_output, index = decode_binary_output_utxo(buffer, index3)
+        return MiningTransaction(height, reward, mining_output), index
+
+    else:
+        count_bytes = Transaction.COUNT_BITS // 8
+
+        # Get inputs
+        index = offset + type_bytes
+        input_num = bytes_to_int(buffer, index, count_bytes)
+        index += count_bytes
+        inputs = []
+        for x in range(0, input_num):
+            input_utxo, index = decode_binary_input_utxo(buffer, index)
+            inputs.append(input_utxo)
 
         # Get outputs
+        output_num = bytes_to_int(buffer, index, count_bytes)
+        index += count_bytes
         outputs = []
-        temp_index += count_index
         for y in range(0, output_num):
-            raw_output_utxo = decode_raw_output_utxo(raw_tx[temp_index:]).raw_utxo
-            outputs.append(raw_output_utxo)
-            temp_index += len(raw_output_utxo)
+            output_utxo, index = decode_binary_output_utxo(buffer, index)
+            outputs.append(output_utxo)
 
         # Get version
-        version = int(raw_tx[temp_index:temp_index + version_index], 16)
+        version = bytes_to_int(buffer, index, Transaction.VERSION_BITS // 8)
+        index += Transaction.VERSION_BITS // 8
 
-        return Transaction(inputs=inputs, outputs=outputs, version=version)
+        return Transaction(inputs=inputs, outputs=outputs, version=version), index
@@ -30,13 +30,52 @@ The UTXO_OUTPUT has the following fields w corresponding size: 33 bytes
 '''
 IMPORTS
 '''
-from helpers import int_to_base58, base58_to_int
+from helpers import int_to_base58, base58_to_int, LRUCache, hex_to_field, field_to_hex, hex_to_bytes, bytes_to_int, \
+    Frozen
 
+'''
+ADDRESS CACHE
+'''
+# The same addresses recur in many utxos, so we keep the conversions between BASE58 address and CEPK in both directions
+ADDRESS_CACHE_SIZE = 10000
+address_to_cepk_cache = LRUCache(ADDRESS_CACHE_SIZE)
+cepk_to_address_cache = LRUCache(ADDRESS_CACHE_SIZE)
 
-class UTXO_INPUT:
-    '''
 
+def address_to_cepk(address: str) -> str:
+    cepk = address_to_cepk_cache.get(address)
+    if cepk is None:
+        cepk = hex(base58_to_int(address))[2:]
+        address_to_cepk_cache.put(address, cepk)
+        cepk_to_address_cache.put(cepk, address)
+    return cepk
+
+
+def cepk_to_address(cepk: str) -> str:
+    address = cepk_to_address_cache.get(cepk)
+    if address is None:
+        address = int_to_base58(int(cepk, 16))
+        cepk_to_address_cache.put(cepk, address)
+        # Only a canonical cepk - no leading zeros - is what address_to_cepk would return for the address
+        if cepk == hex(int(cepk, 16))[2:]:
+            address_to_cepk_cache.put(address, cepk)
+    return address
+
+
+def address_cache_stats() -> dict:
+    return {"address_to_cepk": address_to_cepk_cache.stats, "cepk_to_address": cepk_to_address_cache.stats}
+
+
+def resize_address_cache(maxsize: int):
+    address_to_cepk_cache.resize(maxsize)
+    cepk_to_address_cache.resize(maxsize)
+
+
+class UTXO_INPUT(Frozen):
+    '''
+    A UTXO_INPUT can't be changed once constructed, as the raw and id of its Transaction are cached.
     '''
+    __slots__ = ('tx_id', 'tx_index', 'signature', 'sig_length')
     TX_ID_BITS = 256
     TX_INDEX_BITS = 8
 
@@ -51,6 +90,8 @@ class UTXO_INPUT:
         self.signature = signature
         self.sig_length = format(len(self.signature), '02x')
 
+        self.freeze()
+
     '''
     Properties
     '''
@@ -59,14 +100,25 @@ class UTXO_INPUT:
     def raw_utxo(self):
         return self.tx_id + self.tx_index + self.sig_length + self.signature
 
+    @property
+    def binary_utxo(self):
+        '''
+        The binary form holds the same fields as the raw utxo: 32 bytes of tx_id, 1 byte of tx_index and the signature
+        as a length prefixed field.
+        '''
+        return (hex_to_bytes(self.tx_id, self.TX_ID_BITS // 8) + hex_to_bytes(self.tx_index, self.TX_INDEX_BITS // 8)
+                + hex_to_field(self.signature))
+
 
-class UTXO_OUTPUT:
+class UTXO_OUTPUT(Frozen):
     '''
     The UTXO_OUTPUT object is instantiated by an integer amount and an address.
     The integer amount will be formatted and saved as hex string.
     The address is a BASE58 encoded CEPK, and we save both the address and the CEPK.
     The raw UTXO_OUTPUT object will then be CEPK appended to the formatted amount value.
+    Like the UTXO_INPUT, it can't be changed once constructed.
     '''
+    __slots__ = ('amount', 'address', 'cepk', 'addy_length')
     AMOUNT_BITS = 64
 
     def __init__(self, amount: int, address: str):
@@ -77,9 +129,11 @@ class UTXO_OUTPUT:
         self.address = address
 
         # Get the cepk and addy_length
-        self.cepk = hex(base58_to_int(self.address))[2:]
+        self.cepk = address_to_cepk(self.address)
         self.addy_length = format(len(self.cepk), '02x')
 
+        self.freeze()
+
     '''
     Properties
     '''
@@ -88,6 +142,13 @@ class UTXO_OUTPUT:
     def raw_utxo(self):
         return self.amount + self.addy_length + self.cepk
 
+    @property
+    def binary_utxo(self):
+        '''
+        The binary form holds 8 bytes of amount and the CEPK as a length prefixed field.
+        '''
+        return hex_to_bytes(self.amount, self.AMOUNT_BITS // 8) + hex_to_field(self.cepk)
+
 
 '''
 DECODE RAW UTXOS
@@ -95,32 +156,70 @@ DECODE RAW UTXOS
 
 
 def decode_raw_input_utxo(input_utxo: str):
+    return parse_raw_input_utxo(input_utxo)[0]
+
+
+def decode_raw_output_utxo(output_utxo: str):
+    return parse_raw_output_utxo(output_utxo)[0]
+
+
+def parse_raw_input_utxo(raw: str, offset=0):
     '''
     The string will be given in hex characters and the UTXO_INPUT constants are bit sizes.
-    Divide the bit size by 4 to get the number of hex characters
-    '''
+    Divide the bit size by 4 to get the number of hex characters.
 
-    i1 = UTXO_INPUT.TX_ID_BITS // 4
+    We read the UTXO_INPUT starting at the offset of the string, slicing out only its fields, and return the
+    UTXO_INPUT and the index following it.
+    '''
+    i1 = offset + UTXO_INPUT.TX_ID_BITS // 4
     i2 = i1 + UTXO_INPUT.TX_INDEX_BITS // 4
     i3 = i2 + 2
-    tx_id = input_utxo[:i1]
-    tx_index = int(input_utxo[i1:i2], 16)
-    sig_length = int(input_utxo[i2:i3], 16)
-    sig = input_utxo[i3:i3 + sig_length]
+    tx_id = raw[offset:i1]
+    tx_index = int(raw[i1:i2], 16)
+    sig_length = int(raw[i2:i3], 16)
+    sig = raw[i3:i3 + sig_length]
 
-    return UTXO_INPUT(tx_id, tx_index, sig)
+    return UTXO_INPUT(tx_id, tx_index, sig), i3 + sig_length
 
 
-def decode_raw_output_utxo(output_utxo: str):
+def parse_raw_output_utxo(raw: str, offset=0):
     '''
     The string will be hex chars and the BIT sizes that aren't variable are in the UTXO_OUTPUT class
-    Divide bit size by 4 to get hex chars
+    Divide bit size by 4 to get hex chars.
+
+    We read the UTXO_OUTPUT starting at the offset of the string and return the UTXO_OUTPUT and the index following it.
     '''
-    i1 = UTXO_OUTPUT.AMOUNT_BITS // 4
+    i1 = offset + UTXO_OUTPUT.AMOUNT_BITS // 4
     i2 = i1 + 2
 
-    amount = int(output_utxo[:i1], 16)
-    addy_length = int(output_utxo[i1:i2], 16)
-    address = int_to_base58(int(output_utxo[i2:i2 + addy_length], 16))
+    amount = int(raw[offset:i1], 16)
+    addy_length = int(raw[i1:i2], 16)
+    address = cepk_to_address(raw[i2:i2 + addy_length])
+
+    return UTXO_OUTPUT(amount, address), i2 + addy_length
+
+
+def decode_binary_input_utxo(buffer, offset=0):
+    '''
+    Decodes the binary UTXO_INPUT starting at the offset of the buffer. Returns the UTXO_INPUT and the offset
+    following it.
+    '''
+    i1 = offset + UTXO_INPUT.TX_ID_BITS // 8
+    i2 = i1 + UTXO_INPUT.TX_INDEX_BITS // 8
+    tx_id = format(bytes_to_int(buffer, offset, UTXO_INPUT.TX_ID_BITS // 8), f'0{UTXO_INPUT.TX_ID_BITS // 4}x')
+    tx_index = bytes_to_int(buffer, i1, UTXO_INPUT.TX_INDEX_BITS // 8)
+    sig, end = field_to_hex(buffer, i2)
+
+    return UTXO_INPUT(tx_id, tx_index, sig), end
+
+
+def decode_binary_output_utxo(buffer, offset=0):
+    '''
+    Decodes the binary UTXO_OUTPUT starting at the offset of the buffer. Returns the UTXO_OUTPUT and the offset
+    following it.
+    '''
+    i1 = offset + UTXO_OUTPUT.AMOUNT_BITS // 8
+    amount = bytes_to_int(buffer, offset, UTXO_OUTPUT.AMOUNT_BITS // 8)
+    cepk, end = field_to_hex(buffer, i1)
 
-    return UTXO_OUTPUT(amount, address)
+    return UTXO_OUTPUT(amount, cepk_to_address(cepk)), end
@@ -30,12 +30,18 @@ SIGNATURE ~100 bytes
 IMPORTS
 '''
 
-from cryptography import EllipticCurve
+from coin_selection import select_coins
+from concurrent.futures import ProcessPoolExecutor
+from cryptography import EllipticCurve, batch_inverse, rfc6979_nonces
 from hashlib import sha256, sha512, sha1
-from helpers import base58_to_int, int_to_base58
+from helpers import base58_to_int, int_to_base58, LRUCache
+from transaction import Transaction
+from utxo import UTXO_INPUT, UTXO_OUTPUT
 
-import pandas as pd
+import hmac
+import os
 import secrets
+import threading
 
 '''
 CLASS
@@ -49,13 +55,26 @@ class Wallet:
     MINBIT_EXP = 7
     DICT_EXP = 11
 
-    def __init__(self, seed_bits=128, address_checksum_bits=32, seed=None, a=None, b=None, p=None):
+    # Child keys with index at least HARDENED_INDEX are derived from the private key
+    HARDENED_INDEX = pow(2, 31)
+    CHILD_KEY_CACHE_SIZE = 4096
+
+    def __init__(self, seed_bits=128, address_checksum_bits=32, seed=None, a=None, b=None, p=None, curve=None,
+                 dictionary=None, _keys=None):
         '''
-        
+        The optional curve and dictionary let many wallets share their setup, see generate_many:
+            -curve: an EllipticCurve to use instead of creating one from a, b and p
+            -dictionary: the word list used for the seed phrase, from load_dictionary
+
+        The private _keys argument is only passed by generate_many. It's the (private_key, chain_code,
+        public_key_point) triple of the given seed, from generate_key_batch, so that the seed phrase recovers the keys.
         '''
 
-        # Create the Elliptic curve
-        self.curve = EllipticCurve(a, b, p)
+        # Create the Elliptic curve. Keys are verified when created, so we only validate at the curve API boundaries.
+        if curve is None:
+            self.curve = EllipticCurve(a, b, p, validation=EllipticCurve.VALIDATION_FAST)
+        else:
+            self.curve = curve
 
         # Establish seed bits and checksum_bits
         self.seed_bits = max(seed_bits, pow(2, self.MINBIT_EXP))
@@ -66,6 +85,9 @@ class Wallet:
         # TODO: Remove assert in init, replace with factory method
         assert (self.seed_bits + self.seed_checksum_bits) % self.DICT_EXP == 0
 
+        # Given keys must come from the given seed
+        assert _keys is None or seed is not None, 'Keys need the seed they were generated from'
+
         # Create new seed or use given seen
         if seed is None:
             seed = self.get_seed()
@@ -73,9 +95,56 @@ class Wallet:
             seed = seed
 
         # Use seed to generate keys and seed phrase
-        self.master_keys = self.generate_master_keys(seed)
+        if _keys is None:
+            self.master_keys = self.generate_master_keys(seed)
+        else:
+            private_key, self.chain_code, (x, y) = _keys
+            assert (private_key, self.chain_code) == master_secret(seed), 'Keys do not match the seed'
+            self.master_keys = (hex(x), hex(y)), hex(private_key)
+        self.address_checksum_bits = address_checksum_bits
         self.address = self.get_address(address_checksum_bits)
-        self.seed_phrase = self.get_seed_phrase(seed)  # Saving seed_phrase is only for testing.
+        self.seed_phrase = self.get_seed_phrase(seed, dictionary)  # Saving seed_phrase is only for testing.
+
+        # Derived child keys
+        self.child_keys = LRUCache(self.CHILD_KEY_CACHE_SIZE)
+
+        # Owned output utxos
+        self.utxo_index = UTXOIndex([self.address])
+
+    @classmethod
+    def generate_many(cls, n: int, records=False, workers=1, seed_bits=128, address_checksum_bits=32, a=None,
+                      b=None, p=None):
+        '''
+        Returns a list of n new wallets. If records is True we instead return bare (address, private_key) records,
+        which skips the seed phrases and Wallet objects entirely.
+
+        The work shared across the list is:
+            -All the public keys are generated in one batch, with a single inversion
+            -The wallets share one EllipticCurve and the dictionary is loaded once
+            -With workers > 1 the key generation is split across that many processes
+        '''
+        seed_bits = max(seed_bits, pow(2, cls.MINBIT_EXP))
+        seeds = [random_seed(seed_bits) for _ in range(n)]
+
+        # Generate keys
+        if workers > 1 and n > 1:
+            chunks = [seeds[n * i // workers: n * (i + 1) // workers] for i in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(generate_key_batch, chunk, a, b, p) for chunk in chunks]
+                keys = [key for future in futures for key in future.result()]
+        else:
+            keys = generate_key_batch(seeds, a, b, p)
+
+        # Records
+        if records:
+            return [(address_from_public_key(compress_public_key(point), address_checksum_bits), hex(private_key))
+                    for private_key, _, point in keys]
+
+        # Wallets
+        curve = EllipticCurve(a, b, p, validation=EllipticCurve.VALIDATION_FAST)
+        dictionary = load_dictionary()
+        return [cls(seed_bits, address_checksum_bits, seed, curve=curve, dictionary=dictionary, _keys=key)
+                for seed, key in zip(seeds, keys)]
 
     '''
     PROPERTIES
@@ -94,16 +163,35 @@ class Wallet:
 
     @property
     def compressed_public_key(self):
-        x, y = self.public_key_point
-        parity = y % 2
-        prefix = format(2 + (1 + pow(-1, parity + 1)) // 2, '02x')
-        h_x = hex(x)[2:]
-        return prefix + h_x
+        return compress_public_key(self.public_key_point)
 
     @property
     def hex_address(self):
         return hex(base58_to_int(self.address))[2:]
 
+    @property
+    def balance(self):
+        return self.utxo_index.balance
+
+    '''
+    UTXOS
+    '''
+
+    def watch(self, blockchain, addresses=None):
+        '''
+        We load the output utxos owned by the wallet - its address and any of the given addresses, e.g. child
+        addresses - from the blockchain utxo pool. The utxo index is then kept up to date as Blocks are added or popped.
+        '''
+        if addresses is not None:
+            self.utxo_index.addresses.update(addresses)
+        utxos = blockchain.utxos
+        owned = utxos[utxos['address'].isin(self.utxo_index.addresses)]
+        self.utxo_index.load([tuple(row) for row in owned.values])
+        blockchain.add_utxo_listener(self.utxo_index.update)
+
+    def unwatch(self, blockchain):
+        blockchain.remove_utxo_listener(self.utxo_index.update)
+
     '''
     SEED PHRASE
     '''
@@ -112,18 +200,15 @@ class Wallet:
         '''
         Will generate a random seed if the wallet is instantiated without one
         '''
+        return random_seed(self.seed_bits)
 
-        seed = 0
-        while seed.bit_length() != self.seed_bits:
-            seed = secrets.randbits(self.seed_bits)
-        return seed
-
-    def get_seed_phrase(self, seed: int) -> list:
+    def get_seed_phrase(self, seed: int, dictionary=None) -> list:
         '''
         Will generate a seed phrase from a given seed.
         Phrase will be index values in the dictionary.
         Dictionary size is given by 2^DICT_EXP.
         The bits and seed_checksum bits need to sum to a value divisible by DICT_EXP
+        If no dictionary is given we use the shared word list.
         '''
 
         # Create binary string with bits size
@@ -145,13 +230,14 @@ class Wallet:
             indice = index_string[x * self.DICT_EXP: (x + 1) * self.DICT_EXP]
             index_list.append(int(indice, 2))
 
-        # Load dictionary from file
-        df_dict = pd.read_csv('./english_dictionary.txt', header=None)
+        # Get the shared dictionary
+        if dictionary is None:
+            dictionary = load_dictionary()
 
         # Retrieve the words at the given index and return the seed phrase
         word_list = []
         for i in index_list:
-            word_list.append(df_dict.iloc[[i]].values[0][0])
+            word_list.append(dictionary[i])
         return word_list
 
     def recover_seed(self, seed_phrase: list):
@@ -159,13 +245,11 @@ class Wallet:
         Using the seed phrase, we recover the original seed.
         '''
 
-        # Load dictionary from file
-        df_dict = pd.read_csv('./english_dictionary.txt', header=None)
-
         # Get the dictionary index from the word
+        index_dict = load_word_index()
         number_list = []
         for s in seed_phrase:
-            number_list.append(df_dict.index[df_dict[0] == s].values[0])
+            number_list.append(index_dict[s])
 
         # Express the index as a binary string of fixed DICT_EXP length
         index_string = ''
@@ -188,17 +272,8 @@ class Wallet:
         We save the remaining 256bits as the Master Chain Code
         '''
 
-        # Generate 512-bit hex string
-        seed_hash512 = sha512(str(seed).encode()).hexdigest()
-
-        # Verify bitsize = 512-bits = 64 bytes = 128 hex characters
-        assert len(seed_hash512) == 128
-
-        # Private key is the first 256 bits (64 characters)
-        private_key = int(seed_hash512[:64], 16)
-
-        # Chain code is second 256 bits
-        self.chain_code = int(seed_hash512[64:], 16)
+        # Private key is the first 256 bits of the seed hash. Chain code is second 256 bits
+        private_key, self.chain_code = master_secret(seed)
 
         # Generate public key from private_key
         public_key = self.curve.scalar_multiplication(private_key, self.curve.generator)
@@ -210,6 +285,71 @@ class Wallet:
         x, y = public_key
         return (hex(x), hex(y)), hex(private_key)
 
+    '''
+    CHILD KEYS
+    '''
+
+    def derive_child(self, index: int):
+        '''
+        Returns the (private_key, chain_code, public_key_point) triple of the child key at the given index, following
+        BIP32 private key derivation from the master keys and chain code:
+
+            1) Let k be the master private key, K = k * generator the master public key and c the chain code.
+            2) If index < HARDENED_INDEX, let digest = HMAC-SHA512(c, ser_P(K) || ser_32(index)). Otherwise,
+            let digest = HMAC-SHA512(c, 0x00 || ser_256(k) || ser_32(index)).
+            3) Split digest into its first and last 256 bits, i_left and i_right.
+            4) The child private key is i_left + k (mod n) and the child chain code is i_right.
+
+        Derived keys are kept in the child key cache.
+        '''
+        return self.derive_children(index, index + 1)[0]
+
+    def derive_children(self, start: int, stop: int) -> list:
+        '''
+        Returns the child key triples for every index in [start, stop), see derive_child. The public keys of the
+        children which aren't cached are computed in a single batch.
+        '''
+        assert 0 <= start <= stop <= 2 * self.HARDENED_INDEX
+        n = self.curve.order
+        _, priv = self.master_keys
+        private_key = int(priv, 16)
+
+        # Hash data for the normal and hardened children
+        chain_code = self.chain_code.to_bytes(32, 'big')
+        x, y = self.public_key_point
+        public_data = bytes([2 + y % 2]) + x.to_bytes(32, 'big')
+        private_data = b'\x00' + private_key.to_bytes(32, 'big')
+
+        # Child private keys and chain codes for the indices we haven't cached
+        children = {}
+        missing = []
+        for index in range(start, stop):
+            children[index] = self.child_keys.get(index)
+            if children[index] is not None:
+                continue
+            data = private_data if index >= self.HARDENED_INDEX else public_data
+            digest = hmac.new(chain_code, data + index.to_bytes(4, 'big'), 'sha512').digest()
+            i_left, i_right = int.from_bytes(digest[:32], 'big'), int.from_bytes(digest[32:], 'big')
+
+            # BIP32 skips these indices, which occur with probability below 2^(-127)
+            assert i_left < n and (i_left + private_key) % n != 0
+            missing.append((index, (i_left + private_key) % n, i_right))
+
+        # Public keys in one batch
+        points = self.curve.batch_fixed_base_multiplication([child_key for _, child_key, _ in missing])
+        for (index, child_key, child_chain_code), point in zip(missing, points):
+            children[index] = (child_key, child_chain_code, point)
+            self.child_keys.put(index, children[index])
+
+        return [children[index] for index in range(start, stop)]
+
+    def child_addresses(self, start: int, stop: int) -> list:
+        '''
+        Returns the addresses of the child keys for every index in [start, stop).
+        '''
+        return [address_from_public_key(compress_public_key(point), self.address_checksum_bits)
+                for _, _, point in self.derive_children(start, stop)]
+
     '''
     ADDRESS
     '''
@@ -236,31 +376,52 @@ class Wallet:
 
         '''
 
-        # 1) Get the EPK
-        epk = sha1(sha256(self.compressed_public_key.encode()).hexdigest().encode()).hexdigest()
-
-        # 2 ) Get the checksum and create the CEPK
-        checksum = sha256(sha256(epk.encode()).hexdigest().encode()).hexdigest()[:checksum_bits // 4]
-        cepk = epk + checksum
-
-        # 3) Return the BASE58 encoding of the CEPK
-        return int_to_base58(int(cepk, 16))
+        return address_from_public_key(self.compressed_public_key, checksum_bits)
 
     '''
     TRANSACTIONS
     '''
 
-    def create_transaction(self, address: str, amount: int):
+    def create_transaction(self, address: str, amount: int, fee=0, strategy=None, verify=True):
         '''
-        Will create a transaction
+        Returns a Transaction paying amount to the address, or None if the wallet can't cover amount + fee. The fee is
+        the difference between the inputs and the outputs, which the miner collects.
+
+        We select the inputs from the utxos of the wallet address in the utxo index using select_coins - see
+        coin_selection for the strategies. Any excess is returned to the wallet address in a change output. The inputs
+        sign the tx_id of the output they spend, and all signatures are computed with sign_transactions in one batch.
+
+        The selected utxos are reserved in the utxo index so that later transactions don't spend them again. They're
+        released when the Block spending them is added, or by calling utxo_index.release.
         '''
-        pass
+        assert amount > 0 and fee >= 0
+
+        # Select inputs
+        utxos = [row for row in self.utxo_index.spendable if row[3] == self.address]
+        selection = select_coins(utxos, amount + fee, strategy)
+        if selection is None:
+            return None
 
-    def sign_transaction(self, tx_hash: str):
+        # Sign inputs
+        signatures = self.sign_transactions([tx_id for tx_id, _, _, _ in selection], verify=verify)
+        inputs = [UTXO_INPUT(tx_id, tx_index, sig).raw_utxo for (tx_id, tx_index, _, _), sig in
+                  zip(selection, signatures)]
+
+        # Outputs with change
+        outputs = [UTXO_OUTPUT(amount, address).raw_utxo]
+        change = sum(row[2] for row in selection) - amount - fee
+        if change > 0:
+            outputs.append(UTXO_OUTPUT(change, self.address).raw_utxo)
+
+        self.utxo_index.reserve([(tx_id, tx_index) for tx_id, tx_index, _, _ in selection])
+        return Transaction(inputs=inputs, outputs=outputs)
+
+    def sign_transaction(self, tx_hash: str, verify=True):
         '''
         Given a transaction hash, we return a signature (r,s) following the ECDSA, along with the compressed public key.
         We use the private key of the Wallet in order to sign.
-        We verify that the signature will be successfully validated before returning the signature.
+        If verify is True we verify that the signature will be successfully validated before returning the signature.
+        Callers who don't need the check can pass verify=False and skip its three scalar multiplications.
 
         Algorithm:
         ---------
@@ -270,9 +431,11 @@ class Wallet:
 
         1) Verify that n is prime - the signature will not work if we do not have prime group order.
         2) Let Z denote the integer value of the first n BITS of the transaction hash.
-        3) Select a random integer k in [1, n-1]. As n is prime, k will be invertible.
+        3) Select an integer k in [1, n-1] deterministically from t and the transaction hash, following RFC 6979. As
+            n is prime, k will be invertible.
         4) Calculate the curve point (x,y) =  k * generator
-        5) Compute r = x (mod n) and s = k^(-1)(Z + r * t) (mod n). If either r or s = 0, repeat from step 3.
+        5) Compute r = x (mod n) and s = k^(-1)(Z + r * t) (mod n). If either r or s = 0, repeat from step 3 with the
+            next RFC 6979 candidate.
         6) The signature is the pair (r, s)
 
         Note: The pair (r,s) is the curve signature for the given tx_id. However, we include the compressed public
@@ -291,32 +454,261 @@ class Wallet:
         # 2) Take the first n bits of the transaction hash
         Z = int(bin(int(tx_hash, 16))[2:2 + n], 2)
 
-        # 3) Select a random integer k (Loop from here)
-        signed = False
-        sig = None
-        while not signed:
-            k = secrets.randbelow(n)
+        # 3) Select the deterministic integer k (Loop from here)
+        _, priv = self.master_keys
+        private_key = int(priv, 16)
+        r = s = 0
+        nonces = rfc6979_nonces(private_key, tx_hash, n)
+        while r == 0 or s == 0:
+            k = next(nonces)
 
             # 4) Calculate curve point
             x, y = self.curve.scalar_multiplication(k, self.curve.generator)
 
             # 5) Compute r and s
-            _, priv = self.master_keys
-            private_key = int(priv, 16)
             r = x % n
             s = (pow(k, -1, n) * (Z + r * private_key)) % n
 
+        # Verify the signature. A deterministic k would give the same signature again, so there's nothing to retry.
+        if verify:
+            assert self.curve.verify_signature((r, s), tx_hash, self.public_key_point)
+
+        # 6) Return the signature
+        return self.format_signature(r, s)
+
+    def sign_transactions(self, tx_hashes: list, verify=True) -> list:
+        '''
+        Given a list of transaction hashes, we return the list of signatures following the same algorithm as
+        sign_transaction. The work shared across the list is:
+            -All the points k * generator are normalized with a single inversion
+            -All the k^(-1) (mod n) values are computed with a single inversion
+            -If verify is True, the signatures are verified in a single batch
+
+        Any hash whose signature has r or s = 0 is signed again with sign_transaction.
+        '''
+        assert self.curve.has_prime_order
+        n = self.curve.order
+        _, priv = self.master_keys
+        private_key = int(priv, 16)
+
+        # Deterministic k for every hash
+        k_values = [next(rfc6979_nonces(private_key, tx_hash, n)) for tx_hash in tx_hashes]
+        points = self.curve.batch_fixed_base_multiplication(k_values)
+        k_inverses = batch_inverse(k_values, n)
+
+        # Compute r and s
+        signatures = []
+        entries = []
+        for tx_hash, (x, y), k_inv in zip(tx_hashes, points, k_inverses):
+            Z = int(bin(int(tx_hash, 16))[2:2 + n], 2)
+            r = x % n
+            s = (k_inv * (Z + r * private_key)) % n
+            signatures.append((r, s))
+            entries.append(((r, s), tx_hash, self.public_key_point))
+
+        # Re-sign any zero values and verify the batch
+        sigs = []
+        for index, (tx_hash, (r, s)) in enumerate(zip(tx_hashes, signatures)):
             if r != 0 and s != 0:
-                # Get hex representation
-                h_r = hex(r)[2:]
-                h_s = hex(s)[2:]
+                sigs.append(self.format_signature(r, s))
+            else:
+                sigs.append(self.sign_transaction(tx_hash, verify=verify))
+                entries[index] = None
+        if verify:
+            assert all(self.curve.verify_signatures_batch([entry for entry in entries if entry is not None]))
+        return sigs
+
+    def format_signature(self, r: int, s: int) -> str:
+        '''
+        Returns the signature hex string for the pair (r,s) - the compressed public key followed by r and s, each with
+        a 1 byte length prefix.
+        '''
+        h_r = hex(r)[2:]
+        h_s = hex(s)[2:]
 
-                r_length = format(len(h_r), '02x')
-                s_length = format(len(h_s), '02x')
-                cpk_length = format(len(self.compressed_public_key), '02x')
+        r_length = format(len(h_r), '02x')
+        s_length = format(len(h_s), '02x')
+        cpk_length = format(len(self.compressed_public_key), '02x')
 
-                sig = cpk_length + self.compressed_public_key + r_length + h_r + s_length + h_s
-                signed = self.curve.verify_signature((r, s), tx_hash, self.public_key_point)
+        return cpk_length + self.compressed_public_key + r_length + h_r + s_length + h_s
 
-        # 6) Return the signature
-        return sig
+
+'''
+KEY GENERATION
+'''
+
+
+def random_seed(seed_bits: int) -> int:
+    '''
+    Returns a random seed of exactly seed_bits bits.
+    '''
+    seed = 0
+    while seed.bit_length() != seed_bits:
+        seed = secrets.randbits(seed_bits)
+    return seed
+
+
+def master_secret(seed: int):
+    '''
+    Returns the private key and chain code for the seed - the first and second 256 bits of the sha512 hash of the seed.
+    '''
+    # Generate 512-bit hex string
+    seed_hash512 = sha512(str(seed).encode()).hexdigest()
+
+    # Verify bitsize = 512-bits = 64 bytes = 128 hex characters
+    assert len(seed_hash512) == 128
+
+    return int(seed_hash512[:64], 16), int(seed_hash512[64:], 16)
+
+
+def generate_key_batch(seeds: list, a=None, b=None, p=None) -> list:
+    '''
+    Returns the (private_key, chain_code, public_key_point) triple for each seed. The public keys are computed with
+    a single batch fixed-base multiplication.
+    '''
+    curve = EllipticCurve(a, b, p, validation=EllipticCurve.VALIDATION_FAST)
+    master_secrets = [master_secret(seed) for seed in seeds]
+    points = curve.batch_fixed_base_multiplication([private_key for private_key, _ in master_secrets])
+    return [(private_key, chain_code, point) for (private_key, chain_code), point in zip(master_secrets, points)]
+
+
+def compress_public_key(point: tuple) -> str:
+    '''
+    Returns the compressed public key - the parity prefix followed by the hex x value.
+    '''
+    x, y = point
+    parity = y % 2
+    prefix = format(2 + (1 + pow(-1, parity + 1)) // 2, '02x')
+    h_x = hex(x)[2:]
+    return prefix + h_x
+
+
+def address_from_public_key(compressed_public_key: str, checksum_bits: int) -> str:
+    '''
+    Returns the address of the compressed public key, see Wallet.get_address.
+    '''
+    # 1) Get the EPK
+    epk = sha1(sha256(compressed_public_key.encode()).hexdigest().encode()).hexdigest()
+
+    # 2 ) Get the checksum and create the CEPK
+    checksum = sha256(sha256(epk.encode()).hexdigest().encode()).hexdigest()[:checksum_bits // 4]
+    cepk = epk + checksum
+
+    # 3) Return the BASE58 encoding of the CEPK
+    return int_to_base58(int(cepk, 16))
+
+
+'''
+DICTIONARY
+'''
+
+DICTIONARY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'english_dictionary.txt')
+
+# Shared by all wallets. Loaded from file on first use, and published together under the lock so that a partly
+# built list or index is never seen.
+word_list = None
+word_index = None
+dictionary_lock = threading.Lock()
+
+
+def load_dictionary() -> list:
+    '''
+    Returns the list of dictionary words used for seed phrases.
+    '''
+    global word_list, word_index
+    if word_list is None:
+        with dictionary_lock:
+            if word_list is None:
+                with open(DICTIONARY_PATH) as f:
+                    words = [line.strip() for line in f if line.strip()]
+                word_index = {word: index for index, word in enumerate(words)}
+                word_list = words
+    return word_list
+
+
+def load_word_index() -> dict:
+    '''
+    Returns the dictionary mapping each word to its index in the word list.
+    '''
+    load_dictionary()
+    return word_index
+
+
+'''
+UTXO INDEX
+'''
+
+
+class UTXOIndex:
+    '''
+    The UTXOIndex holds the output utxos owned by a set of addresses, keyed by (tx_id, tx_index). It's updated
+    incrementally from the Blockchain utxo listener events, and keeps a running total so that balances are O(1).
+    '''
+
+    def __init__(self, addresses: list):
+        self.addresses = set(addresses)
+        self.utxos = {}
+        self.balances = {}
+        self.balance = 0
+
+        # Utxos spent by transactions which aren't in a Block yet
+        self.reserved = set()
+
+    def __len__(self):
+        return len(self.utxos)
+
+    def __contains__(self, key):
+        return key in self.utxos
+
+    def balance_of(self, address: str) -> int:
+        return self.balances.get(address, 0)
+
+    @property
+    def spendable(self) -> list:
+        '''
+        Returns the owned (tx_id, tx_index, amount, address) rows which aren't reserved.
+        '''
+        return [(tx_id, tx_index, amount, address) for (tx_id, tx_index), (amount, address) in self.utxos.items()
+                if (tx_id, tx_index) not in self.reserved]
+
+    def reserve(self, keys: list):
+        self.reserved.update(keys)
+
+    def release(self, keys: list):
+        self.reserved.difference_update(keys)
+
+    def load(self, rows: list):
+        '''
+        Replaces the index with the given (tx_id, tx_index, amount, address) rows.
+        '''
+        self.utxos = {}
+        self.balances = {}
+        self.balance = 0
+        self.update(rows, [])
+
+    def update(self, added: list, removed: list):
+        '''
+        Applies the utxo changes of an added or popped Block. Rows for addresses we don't own are ignored.
+        '''
+        for tx_id, tx_index, amount, address in removed:
+            self.reserved.discard((tx_id, int(tx_index)))
+            if address in self.addresses and self.utxos.pop((tx_id, int(tx_index)), None) is not None:
+                self.change_balance(address, -parse_amount(amount))
+        for tx_id, tx_index, amount, address in added:
+            key = (tx_id, int(tx_index))
+            if address in self.addresses and key not in self.utxos:
+                self.utxos[key] = (parse_amount(amount), address)
+                self.change_balance(address, parse_amount(amount))
+
+    def change_balance(self, address: str, amount: int):
+        self.balances[address] = self.balances.get(address, 0) + amount
+        self.balance += amount
+
+
+def parse_amount(amount) -> int:
+    '''
+    The utxo pool stores amounts as hex strings.
+    '''
+    if isinstance(amount, str):
+        return int(amount, 16)
+    return int(amount)